@@ -0,0 +1,243 @@
+"""Benchmarks of the dashboard's hot paths on synthetic tables.
+
+For each table size (``synth_data.py``; generated on first use) every step is
+timed in isolation on prepared inputs:
+
+* ``load.*``       parsing the CSV, ingesting and opening the columnar store;
+* ``aggregate.*``  building the segment cube;
+* ``filter.*``     the sidebar filter, on the rows and on the cube;
+* ``page.*``       each page's aggregation block, as ``churn_core`` computes it;
+* ``chart.*``      rendering each page's charts to PNG;
+* ``model.*``      scoring every row with the churn model.
+
+Each case reports the best wall time of ``--repeat`` runs, rows/sec (table
+rows over that time, also for steps that only touch the cube) and the peak
+traced allocation of one extra run (``tracemalloc``; memory-mapped pages are
+not counted). Results go to a JSON file stamped with the commit, so runs can
+be compared:
+
+    python benchmarks.py [--sizes 10k 1m] [--only page chart] [--skip model]
+    python benchmarks.py --compare bench_results/OLD.json bench_results/NEW.json
+"""
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import matplotlib
+matplotlib.use("Agg")
+
+import numpy as np
+import pandas as pd
+
+import churn_core as core
+import churn_data
+import columnar_store
+import synth_data
+from segment_cube import build_cube
+
+RESULTS_DIR = "bench_results"
+# A narrowed sidebar filter and the Segment Explorer's dimension pair.
+FILTER = (["Germany", "Spain"], ["Male", "Female"], ["30–45", "46–60"])
+EXPLORER = ("CreditBand", "NumOfProducts")
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def measure(fn, repeat=3, memory=True):
+    """``(best seconds, mean seconds, peak traced bytes or None)`` of ``fn()``."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return min(times), sum(times) / len(times), peak
+
+
+def _render(*figs):
+    from figure_cache import render_png
+    return [render_png(fig) for fig in figs]
+
+
+def cases(csv, groups):
+    """Yield ``(name, fn, repeat_override)`` for one table; inputs are prepared lazily."""
+    ctx = {}
+
+    def prepared():
+        """The store-backed table as the app loads it, its cube and the filtered view."""
+        if not ctx:
+            store = columnar_store.default_store_dir(csv)
+            if not columnar_store.is_fresh(csv, store):
+                columnar_store.ingest(csv, store)
+            ctx["df"] = df = columnar_store.load(csv)
+            ctx["cube"] = cube = build_cube(df)
+            ctx["fcube"] = core.filter_cube(cube, *FILTER)
+            ctx["mask"] = core.row_mask(df, *FILTER)
+        return ctx
+
+    if "load" in groups:
+        yield "load.csv", lambda: churn_data.load_data(csv), None
+        yield "load.ingest_store", lambda: columnar_store.ingest(csv), 1
+        yield "load.store", lambda: columnar_store.load(csv), None
+    if "aggregate" in groups:
+        yield "aggregate.cube", lambda: build_cube(prepared()["df"]), None
+    if "filter" in groups:
+        yield "filter.rows", lambda: churn_data.filter_mask(prepared()["df"], *FILTER), None
+        yield "filter.cube", lambda: core.filter_cube(prepared()["cube"], *FILTER), None
+
+    if "page" in groups or "chart" in groups:
+        df, fcube, mask = (prepared()[k] for k in ("df", "fcube", "mask"))
+
+    if "page" in groups:
+        yield "page.overview", lambda: (
+            core.overview(fcube),
+            [core.segment_table(fcube, d) for d in ("Geography", "AgeGroup", "NumOfProducts")]), None
+        yield "page.geographic", lambda: (
+            core.geo_stats(fcube), core.pivot(fcube, "Geography", "AgeGroup")), None
+        yield "page.demographic", lambda: (
+            core.age_table(fcube), core.gender_table(fcube), core.activity_table(fcube),
+            core.pivot(fcube, "Geography", "Gender")), None
+        yield "page.financial", lambda: (
+            core.product_table(fcube), core.balance_table(fcube), core.credit_table(fcube),
+            core.high_value(df, mask), core.overview(fcube)), None
+        yield "page.explorer", lambda: (
+            core.rate_table(fcube, EXPLORER[0]), core.pivot(fcube, *EXPLORER)), None
+        yield "page.explorer_scan", lambda: core.hot_spots(fcube), None
+
+    if "chart" in groups:
+        import charts
+        from charts import ACCENT, GREEN, LIGHT
+
+        def bars(tbl, dim, title, figsize=(5,4)):
+            return charts.churn_bars(tbl[dim].astype(str).tolist(), tbl["ChurnRate"].tolist(),
+                                     None, title, figsize)
+
+        kpis = core.overview(fcube)
+        geo, age, gen = core.geo_stats(fcube), core.age_table(fcube), core.gender_table(fcube)
+        act, prod = core.activity_table(fcube), core.product_table(fcube)
+        bal, cred = core.balance_table(fcube), core.credit_table(fcube)
+        hv = core.high_value(df, mask)
+        geo_age = core.pivot(fcube, "Geography", "AgeGroup")
+        geo_gender = core.pivot(fcube, "Geography", "Gender")
+        explorer = core.pivot(fcube, *EXPLORER)
+        yield "chart.overview", lambda: _render(
+            charts.donut(kpis["Retained"], kpis["Churned"]),
+            bars(geo, "Geography", "Churn Rate by Country"),
+            bars(age, "AgeGroup", "Churn Rate by Age Group"),
+            bars(prod, "NumOfProducts", "Churn Rate by Products Held")), None
+        yield "chart.geographic", lambda: _render(
+            bars(geo, "Geography", "Churn Rate by Country", (6,4)),
+            charts.paired_bars(geo["Geography"],
+                               {"Retained": (geo["Customers"]-geo["Churned"], GREEN),
+                                "Churned": (geo["Churned"], ACCENT)},
+                               "Churned vs Retained by Country"),
+            charts.heatmap(geo_age, "Churn Rate (%) — Geography × Age Group")), None
+        yield "chart.demographic", lambda: _render(
+            bars(age, "AgeGroup", "Churn Rate by Age Group", (6,4)),
+            bars(gen, "Gender", "Churn Rate by Gender", (6,4)),
+            bars(act, "Label", "Churn Rate: Active vs Inactive"),
+            charts.paired_bars(geo_gender.index,
+                               {c: (geo_gender[c], col) for c, col in zip(geo_gender.columns, (ACCENT, LIGHT))},
+                               "Churn Rate by Country & Gender", (5,4), 12, "Churn Rate (%)")), None
+        yield "chart.financial", lambda: _render(
+            bars(prod, "NumOfProducts", "Churn Rate by Products Held", (6,4)),
+            bars(bal, "BalanceSeg", "Churn Rate by Balance Segment", (6,4)),
+            bars(cred, "CreditBand", "Churn Rate by Credit Score Band"),
+            charts.churn_bars(["All Customers", "High-Value (Top 25%)"],
+                              [round(kpis["Churn Rate (%)"], 1), round(hv["Churn Rate (%)"], 1)],
+                              [LIGHT, ACCENT], "High-Value vs Overall Churn Rate")), None
+        yield "chart.explorer", lambda: _render(
+            bars(cred, "CreditBand", "Churn Rate by Credit Band", (6,4.5)),
+            charts.heatmap(explorer, "Churn Rate: Credit Band × Products Held", (6,4.5), 10, 12,
+                           "Products Held", "Credit Band", 30)), None
+
+    if "model" in groups:
+        import churn_model
+        model, meta = churn_model.get_model(churn_data.load_data(churn_data.DATA_PATH))
+        yield "model.score", lambda: churn_model.score(model, meta, prepared()["df"]), 1
+
+
+def run(sizes, groups, repeat=3, memory=True):
+    results = []
+    for size in sizes:
+        if not os.path.exists(synth_data.default_path(size)):
+            print(f"generating {synth_data.default_path(size)} …", flush=True)
+        csv = synth_data.ensure(size)
+        rows = synth_data.n_rows(size)
+        for name, fn, n in cases(csv, groups):
+            best, mean, peak = measure(fn, n or repeat, memory)
+            results.append({"size": size, "rows": rows, "case": name, "seconds": best,
+                            "mean_seconds": mean, "runs": n or repeat,
+                            "peak_mb": None if peak is None else peak / 1e6,
+                            "rows_per_sec": rows / best if best else None})
+            mem = "" if peak is None else f" · peak {peak / 1e6:9.1f} MB"
+            print(f"{size:>4} {name:<22} {best * 1e3:11.2f} ms · {rows / best:>14,.0f} rows/s{mem}",
+                  flush=True)
+    return results
+
+
+def compare(old_path, new_path):
+    with open(old_path, encoding="utf-8") as f:
+        old = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+    key = ["size", "case"]
+    both = pd.DataFrame(old["results"]).merge(pd.DataFrame(new["results"]), on=key,
+                                              suffixes=("_old", "_new"))
+    both["speedup"] = both["seconds_old"] / both["seconds_new"]
+    print(f"{old['commit']} → {new['commit']}")
+    for r in both.itertuples():
+        flag = "  ◀ slower" if r.speedup < 0.9 else ""
+        print(f"{r.size:>4} {r.case:<22} {r.seconds_old * 1e3:11.2f} → {r.seconds_new * 1e3:11.2f} ms"
+              f"  ×{r.speedup:5.2f}{flag}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    GROUPS = ["load", "aggregate", "filter", "page", "chart", "model"]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["10k", "1m"],
+                        help=f"{', '.join(synth_data.SIZES)} or row counts")
+    parser.add_argument("--only", nargs="+", choices=GROUPS, default=GROUPS)
+    parser.add_argument("--skip", nargs="+", choices=GROUPS, default=[])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--out", help=f"results file (default {RESULTS_DIR}/<commit>-<time>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        raise SystemExit
+
+    commit = _commit()
+    groups = [g for g in args.only if g not in args.skip]
+    results = run(args.sizes, groups, args.repeat, not args.no_memory)
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}-{time.strftime('%Y%m%dT%H%M%S')}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"commit": commit, "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                   "python": platform.python_version(), "numpy": np.__version__,
+                   "pandas": pd.__version__, "cpus": os.cpu_count(),
+                   "machine": platform.machine(), "results": results}, f, indent=1)
+    print(f"results → {out}")
@@ -0,0 +1,112 @@
+"""Matplotlib figures of the dashboard, one function per chart type.
+
+Every function returns a new ``Figure`` built from the tables of
+``churn_core``; the app sends it through the figure cache and
+``benchmarks.py`` times it in isolation.
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+import seaborn as sns
+
+# ── Colour palette ────────────────────────────────────────────────────────────
+BLUE      = "#1F4E79"
+LIGHT     = "#2E75B6"
+ACCENT    = "#E74C3C"
+GREEN     = "#27AE60"
+BG        = "#F0F4F8"
+GOLD      = "#F39C12"
+
+# Segments are highlighted only when their churn differs significantly from the
+# rest of the filtered view (two-proportion test, Bonferroni-corrected): red /
+# green bars, and the matching KPI card classes of the app's stylesheet.
+SIG_COLORS = {"▲ higher": ACCENT, "▼ lower": GREEN}
+SIG_CARDS  = {"▲ higher": "red-card", "▼ lower": "green-card"}
+
+
+def sig_colors(tbl):
+    """Bar colours of a ``churn_core`` rate table from its "vs Baseline" column."""
+    return [SIG_COLORS.get(s, LIGHT) for s in tbl["vs Baseline"]]
+
+
+def bar_chart(ax, categories, values, colors=None, title="", ylabel="Churn Rate (%)", fmt="{:.1f}%"):
+    c = colors or [LIGHT]*len(categories)
+    bars = ax.bar(categories, values, color=c, edgecolor="white", linewidth=0.8, width=0.6)
+    for bar, val in zip(bars, values):
+        ax.text(bar.get_x()+bar.get_width()/2, bar.get_height()+0.3,
+                fmt.format(val), ha="center", va="bottom", fontsize=10, fontweight="bold", color="#333")
+    ax.set_title(title, fontsize=13, fontweight="bold", color=BLUE, pad=12)
+    ax.set_ylabel(ylabel, fontsize=10)
+    ax.spines[["top","right"]].set_visible(False)
+    ax.set_facecolor("#FAFAFA")
+    ax.grid(axis="y", alpha=0.3, linestyle="--")
+    ax.set_ylim(0, max(values)*1.2 if values else 1)
+
+
+def churn_bars(categories, values, colors=None, title="", figsize=(5,4)):
+    """Labelled churn-rate bars, one per segment."""
+    fig, ax = plt.subplots(figsize=figsize)
+    bar_chart(ax, categories, values, colors, title)
+    return fig
+
+
+def donut(retained, churned):
+    """Retained vs churned customers."""
+    fig, ax = plt.subplots(figsize=(5,4))
+    sizes  = [retained, churned]
+    colors = [GREEN, ACCENT]
+    wedges, texts, autotexts = ax.pie(
+        sizes, colors=colors, autopct="%1.1f%%",
+        startangle=90, pctdistance=0.75,
+        wedgeprops=dict(width=0.5, edgecolor="white", linewidth=2)
+    )
+    for at in autotexts:
+        at.set_fontsize(12); at.set_fontweight("bold"); at.set_color("white")
+    ax.legend(["Retained","Churned"], loc="lower center", ncol=2, frameon=False)
+    ax.set_title("Retained vs Churned", fontsize=13, fontweight="bold", color=BLUE)
+    return fig
+
+
+def paired_bars(labels, series, title, figsize=(6,4), title_size=13, ylabel=None):
+    """Two bars per label; ``series`` maps legend name → (values, colour)."""
+    fig, ax = plt.subplots(figsize=figsize)
+    x = np.arange(len(labels)); w = 0.35
+    (name_a, (values_a, color_a)), (name_b, (values_b, color_b)) = series.items()
+    ax.bar(x-w/2, values_a, w, label=name_a, color=color_a)
+    ax.bar(x+w/2, values_b, w, label=name_b, color=color_b)
+    ax.set_xticks(x); ax.set_xticklabels(labels)
+    ax.legend(); ax.set_title(title, fontsize=title_size, fontweight="bold", color=BLUE)
+    ax.spines[["top","right"]].set_visible(False)
+    ax.set_facecolor("#FAFAFA"); ax.grid(axis="y", alpha=0.3, linestyle="--")
+    if ylabel:
+        ax.set_ylabel(ylabel)
+    return fig
+
+
+def histogram(values, title, xlabel, color=LIGHT, figsize=(6,4), marks=(5, 50, 95)):
+    """Distribution of simulated ``values`` with dashed percentile markers."""
+    fig, ax = plt.subplots(figsize=figsize)
+    ax.hist(values, bins=50, color=color, edgecolor="white", linewidth=0.5)
+    top = ax.get_ylim()[1]
+    for p, v in zip(marks, np.percentile(values, marks)):
+        ax.axvline(v, color=BLUE, linestyle="--", linewidth=1)
+        ax.text(v, top*0.97, f"P{p}", ha="center", va="top", fontsize=9,
+                fontweight="bold", color=BLUE, backgroundcolor="white")
+    ax.set_title(title, fontsize=13, fontweight="bold", color=BLUE, pad=12)
+    ax.set_xlabel(xlabel, fontsize=10); ax.set_ylabel("Simulations", fontsize=10)
+    ax.spines[["top","right"]].set_visible(False)
+    ax.set_facecolor("#FAFAFA"); ax.grid(axis="y", alpha=0.3, linestyle="--")
+    return fig
+
+
+def heatmap(pivot, title, figsize=(10,3.5), annot_size=11, title_size=13,
+            xlabel="", ylabel="", xrotation=0):
+    """Annotated churn-rate (%) heatmap of a ``churn_core.pivot`` table."""
+    fig, ax = plt.subplots(figsize=figsize)
+    sns.heatmap(pivot, annot=True, fmt=".1f", cmap="RdYlGn_r",
+                ax=ax, linewidths=0.5, annot_kws={"size":annot_size,"weight":"bold"},
+                cbar_kws={"label":"Churn Rate (%)"})
+    ax.set_title(title, fontsize=title_size, fontweight="bold", color=BLUE)
+    ax.set_ylabel(ylabel); ax.set_xlabel(xlabel)
+    if xrotation:
+        plt.xticks(rotation=xrotation, ha="right")
+    return fig
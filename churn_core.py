@@ -0,0 +1,330 @@
+"""Headless segmentation API: the dashboard's data and tables as plain functions.
+
+Everything the Streamlit pages show — KPIs, per-dimension churn tables,
+pivots, high-value churn, the explorer's tables — is computed here from a
+filtered segment cube (or, where raw rows are needed, a row mask), so batch
+jobs can reuse it without Streamlit. ``dashboard.py`` is a thin client that
+only adds caching, widgets and charts on top.
+
+Only pandas and the data-layer modules are imported up front; the
+statistics, scan, Year-partition, model, drill-down, clustering, simulation
+and process-pool modules are imported on first use, and no plotting library is
+imported at all.
+
+Behavioural clusters (``clustering.py``) enter as one more dimension:
+``load_clusters()`` adds a Cluster column to the table, and the cube, Year
+cubes and drill-down index of such a table carry it like any band.
+
+``python churn_core.py TABLE [--geo ...] [--gender ...] [--age ...] [--year Y]
+[--dim D] [--dim2 D] [--k K] [--bands FILE] [--format csv|json]`` prints one table;
+``python churn_core.py --list`` names them.
+"""
+import pandas as pd
+
+import churn_data
+import columnar_store
+from segment_cube import CUBE_DIMS, build_cube, churn_pivot, rollup, slice_cube, totals
+
+GEOGRAPHIES = ["France", "Germany", "Spain"]
+GENDERS     = ["Male", "Female"]
+AGE_GROUPS  = list(churn_data.BANDS["AgeGroup"][2])
+
+# Segment Explorer dimensions: display name → cube column.
+DIMENSIONS = {
+    "Geography":       "Geography",
+    "Age Group":       "AgeGroup",
+    "Gender":          "Gender",
+    "Credit Band":     "CreditBand",
+    "Tenure Group":    "TenureGroup",
+    "Balance Segment": "BalanceSeg",
+    "Products Held":   "NumOfProducts",
+    "Active Member":   "IsActiveMember",
+}
+
+# The explorer can also group by behavioural cluster, a column of clustered tables.
+CLUSTER_DIM = "Cluster"
+EXPLORER_DIMENSIONS = {**DIMENSIONS, "Behaviour Cluster": CLUSTER_DIM}
+
+# Columns segment_stats.annotate() adds to a roll-up.
+CI_COLS = ["CI Low (%)", "CI High (%)", "p-value", "vs Baseline"]
+
+# Tables of at least this many rows are aggregated and scored in a process
+# pool (CHURN_WORKERS, default one per CPU); below it start-up isn't worth it.
+PARALLEL_MIN_ROWS = 500_000
+
+
+# ── Loading ───────────────────────────────────────────────────────────────────
+def load_data(path=churn_data.DATA_PATH, bands=None):
+    """The banded customer table: memory-mapped columnar store, else the parsed CSV.
+
+    ``bands`` (as ``churn_data.load_bands()`` returns them) re-bins it in memory.
+    """
+    df = columnar_store.load(path)
+    return churn_data.Rebinner(df).apply(bands) if bands else df
+
+
+def worker_count(df):
+    if len(df) < PARALLEL_MIN_ROWS:
+        return 1
+    import parallel
+    return parallel.default_workers()
+
+
+def table_source(df, path=churn_data.DATA_PATH):
+    """Columnar store directory for pool workers to memory-map, else ``df`` itself."""
+    store = columnar_store.default_store_dir(path)
+    if df.attrs.get("bands") or not columnar_store.is_fresh(path, store):
+        return df
+    return store
+
+
+def cube_dims(df):
+    """Cube dimensions of ``df``: the bands, plus Cluster for a clustered table."""
+    return CUBE_DIMS + [CLUSTER_DIM] if CLUSTER_DIM in df.columns else CUBE_DIMS
+
+
+def load_cube(df, path=churn_data.DATA_PATH):
+    """Segment cube of ``df``, built shard-parallel for large (unclustered) tables."""
+    workers = worker_count(df)
+    if workers == 1 or CLUSTER_DIM in df.columns:
+        return build_cube(df, cube_dims(df))
+    import parallel
+    return parallel.aggregate(table_source(df, path), workers=workers).cube
+
+
+def load_years(path=churn_data.DATA_PATH, df=None):
+    """Per-Year aggregates of ``path``, refreshed incrementally.
+
+    The persisted partitions hold the default bands; for a re-banded or
+    clustered ``df`` the per-Year cubes are built from its rows instead.
+    """
+    import year_partitions
+    if df is not None and (df.attrs.get("bands") or CLUSTER_DIM in df.columns):
+        return year_partitions.FrameYears(df, cube_dims(df))
+    return year_partitions.refresh(path)
+
+
+def load_scores(df, path=churn_data.DATA_PATH):
+    """``(probabilities, meta)`` of the churn model for every row of ``df``."""
+    import churn_model
+    return churn_model.score_table(df, workers=worker_count(df), source=table_source(df, path))
+
+
+def load_index(df):
+    """Per-segment row indexes of ``df`` for the customer drill-down."""
+    from drilldown import SegmentIndex
+    return SegmentIndex(df, ["Year"] + cube_dims(df))
+
+
+def load_clusters(df, k=None):
+    """``df`` with a Cluster column (C1 … Ck, largest first) of its behavioural clusters.
+
+    Assignments are cached per feature data and k (``clustering.get_clusters``).
+    """
+    import clustering
+    k = k or clustering.DEFAULT_K
+    labels, _ = clustering.get_clusters(df, k)
+    return df.assign(**{CLUSTER_DIM: clustering.as_category(labels, k)})
+
+
+def cluster_sweep(df, ks=None):
+    """Inertia and silhouette per cluster count, fitted on a sample of ``df``."""
+    import clustering
+    return clustering.sweep(df, ks or clustering.K_RANGE)
+
+
+# ── Filtering ─────────────────────────────────────────────────────────────────
+def filter_cube(cube, geo, gender, age, year=None, years=None):
+    """Cube slice of the filter; with ``year``, of that partition of ``years``."""
+    return slice_cube(cube if year is None else years.cube(year), geo, gender, age)
+
+
+def row_mask(df, geo, gender, age, year=None):
+    mask = churn_data.filter_mask(df, geo, gender, age)
+    if year is not None:
+        mask &= df["Year"].to_numpy() == year
+    return mask
+
+
+# ── Page tables ───────────────────────────────────────────────────────────────
+def overview(fcube):
+    """Headline customer counts and churn rate (%) of the view."""
+    total, churned = totals(fcube)
+    return {"Customers": total, "Churned": churned, "Retained": total - churned,
+            "Churn Rate (%)": churned/total*100 if total else float("nan")}
+
+
+def segment_table(fcube, dim):
+    """Roll-up of ``dim`` with Wilson CIs and a significance test vs the rest of the view."""
+    import segment_stats
+    base_n, base_churned = totals(fcube)
+    return segment_stats.annotate(rollup(fcube, dim), base_n, base_churned)
+
+
+def rate_table(fcube, dim, cols=("Customers", "Churned")):
+    """``dim``, ``cols``, ChurnRate in % (1 dp) and the CI columns, one row per segment."""
+    out = segment_table(fcube, dim)[list(cols) + ["ChurnRate"] + CI_COLS].reset_index()
+    out["ChurnRate"] = (out["ChurnRate"]*100).round(1)
+    return out
+
+
+def geo_stats(fcube):
+    """Per-country table of the Geographic page."""
+    out = segment_table(fcube, "Geography").reset_index()
+    out["ChurnRate"]  = (out["ChurnRate"]*100).round(1)
+    out["AvgBalance"] = out["AvgBalance"].round(0).astype(int)
+    out["AvgAge"]     = out["AvgAge"].round(1)
+    return out
+
+
+def age_table(fcube):
+    return rate_table(fcube, "AgeGroup", ["Customers"])
+
+
+def gender_table(fcube):
+    return rate_table(fcube, "Gender")
+
+
+def activity_table(fcube):
+    out = rate_table(fcube, "IsActiveMember")
+    out.insert(1, "Label", out["IsActiveMember"].map({0: "Inactive", 1: "Active"}))
+    return out
+
+
+def product_table(fcube):
+    return rate_table(fcube, "NumOfProducts")
+
+
+def balance_table(fcube):
+    return rate_table(fcube, "BalanceSeg", ["Customers"])
+
+
+def credit_table(fcube):
+    return rate_table(fcube, "CreditBand", ["Customers"])
+
+
+def pivot(fcube, rows, cols):
+    """Churn rate (%, 1 dp) of ``rows`` × ``cols``."""
+    return churn_pivot(fcube, rows, cols).round(1)
+
+
+def high_value(df, mask, q=0.75):
+    """Churn of the view's top ``1 - q`` customers by Balance and the balance they took."""
+    rows = df.loc[mask, ["Balance", "Exited"]]
+    threshold = rows["Balance"].quantile(q)
+    hv = rows[rows["Balance"] >= threshold]
+    churned = hv["Exited"] == 1
+    return {"Threshold": threshold, "Customers": len(hv), "Churned": int(churned.sum()),
+            "Churn Rate (%)": hv["Exited"].mean()*100,
+            "Assets Lost": hv.loc[churned, "Balance"].sum()}
+
+
+def cluster_profile(df, mask=None):
+    """Customers, churn rate and feature means per cluster of a clustered ``df``'s ``mask`` rows."""
+    import clustering
+    rows = df if mask is None else df[mask]
+    clusters = rows[CLUSTER_DIM]
+    return clustering.profile(rows, clusters.cat.codes.to_numpy(), len(clusters.cat.categories))
+
+
+def target_mask(df, mask, segment=None, high_value_q=None):
+    """``mask`` narrowed to ``segment`` (column → values) and, with ``high_value_q``,
+    to customers at or above that Balance quantile of the ``mask`` rows."""
+    out = mask.copy()
+    for col, values in (segment or {}).items():
+        out &= df[col].isin(values).to_numpy()
+    if high_value_q is not None:
+        out &= df["Balance"].to_numpy() >= df.loc[mask, "Balance"].quantile(high_value_q)
+    return out
+
+
+def simulate_retention(df, target, effect, sd=0.0, sims=10_000, seed=0):
+    """Monte-Carlo retained churners and assets of a campaign on the ``target`` rows."""
+    from retention_sim import Churners, simulate
+    return simulate(Churners.of(df, target), effect, sd, sims, seed)
+
+
+def hot_spots(fcube, max_order=3, min_support=0.01):
+    """Every 2..``max_order``-way segment of the explorer dimensions, ranked by lift."""
+    from segment_scan import scan
+    return scan(fcube, list(DIMENSIONS.values()), customers="Customers", churned="Churned",
+                max_order=max_order, min_support=min_support,
+                names={v: k for k, v in DIMENSIONS.items()})
+
+
+def yoy(years, dim, year, geo, gender, age):
+    """Churn rate per ``dim`` segment in ``year`` vs the previous year, or ``None``."""
+    import year_partitions
+    return year_partitions.yoy_deltas(years, dim, year, geo, gender, age)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    def _dim(name):
+        return EXPLORER_DIMENSIONS.get(name, name)
+
+    # name → fn(args, df, fcube, mask, years) returning a DataFrame or dict.
+    TABLES = {
+        "overview":  lambda a, df, c, m, y: overview(c),
+        "geo":       lambda a, df, c, m, y: geo_stats(c),
+        "age":       lambda a, df, c, m, y: age_table(c),
+        "gender":    lambda a, df, c, m, y: gender_table(c),
+        "activity":  lambda a, df, c, m, y: activity_table(c),
+        "products":  lambda a, df, c, m, y: product_table(c),
+        "balance":   lambda a, df, c, m, y: balance_table(c),
+        "credit":    lambda a, df, c, m, y: credit_table(c),
+        "segment":   lambda a, df, c, m, y: rate_table(c, _dim(a.dim)),
+        "pivot":     lambda a, df, c, m, y: pivot(c, _dim(a.dim), _dim(a.dim2)),
+        "geo-age":   lambda a, df, c, m, y: pivot(c, "Geography", "AgeGroup"),
+        "geo-gender": lambda a, df, c, m, y: pivot(c, "Geography", "Gender"),
+        "high-value": lambda a, df, c, m, y: high_value(df, m),
+        "hot-spots": lambda a, df, c, m, y: hot_spots(c, a.max_order, a.min_support),
+        "clusters":  lambda a, df, c, m, y: cluster_profile(df, m),
+        "cluster-sweep": lambda a, df, c, m, y: cluster_sweep(df),
+        "yoy":       lambda a, df, c, m, y: yoy(y, _dim(a.dim), a.year or y.years[-1],
+                                                a.geo, a.gender, a.age),
+    }
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("table", nargs="?", choices=list(TABLES))
+    parser.add_argument("--list", action="store_true", help="list the tables and exit")
+    parser.add_argument("--csv", default=churn_data.DATA_PATH)
+    parser.add_argument("--bands", default=churn_data.BANDS_PATH, help="band edges JSON file")
+    parser.add_argument("--geo", nargs="+", default=GEOGRAPHIES)
+    parser.add_argument("--gender", nargs="+", default=GENDERS)
+    parser.add_argument("--age", nargs="+", help="age groups (default: all of the banding)")
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--dim", default="Geography", help="explorer dimension (display name or column)")
+    parser.add_argument("--dim2", default="Age Group")
+    parser.add_argument("--k", type=int, help="behavioural clusters (default: clustering.DEFAULT_K)")
+    parser.add_argument("--max-order", type=int, default=3)
+    parser.add_argument("--min-support", type=float, default=0.01)
+    parser.add_argument("--format", choices=["csv", "json"], default="csv")
+    args = parser.parse_args()
+    if args.list or not args.table:
+        print("\n".join(TABLES))
+        sys.exit(0)
+
+    bands = churn_data.load_bands(args.bands)
+    args.age = args.age or bands["AgeGroup"][2]
+    df = load_data(args.csv, bands)
+    if args.table == "clusters" or CLUSTER_DIM in (
+            (_dim(args.dim), _dim(args.dim2)) if args.table in ("segment", "pivot", "yoy") else ()):
+        df = load_clusters(df, args.k)
+    years = load_years(args.csv, df) if args.year is not None or args.table == "yoy" else None
+    fcube = filter_cube(load_cube(df, args.csv), args.geo, args.gender, args.age, args.year, years)
+    mask = row_mask(df, args.geo, args.gender, args.age, args.year)
+
+    out = TABLES[args.table](args, df, fcube, mask, years)
+    if out is None:
+        sys.exit("no earlier year in the data to compare against")
+    if isinstance(out, dict):
+        out = pd.DataFrame([out])
+    if not isinstance(out.index, pd.RangeIndex):
+        out = out.reset_index()
+    if args.format == "json":
+        print(out.to_json(orient="records", force_ascii=False, indent=1))
+    else:
+        out.to_csv(sys.stdout, index=False)
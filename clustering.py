@@ -0,0 +1,277 @@
+"""Behavioural customer clusters from mini-batch k-means, fitted out of core.
+
+The bands of ``churn_data`` are fixed cut points; these clusters are learnt
+from the standardised numeric features instead. Everything is done a chunk at
+a time, from a loaded frame or straight from a CSV, so the standardised
+feature matrix is never materialised:
+
+* one pass accumulates per-feature mean and variance (``Scaler``);
+* ``fit()`` streams ``EPOCHS`` passes of standardised chunks through
+  scikit-learn's ``MiniBatchKMeans.partial_fit`` in ``BATCH_ROWS`` batches;
+* ``assign()`` labels every row, chunk by chunk, with plain numpy.
+
+Clusters are numbered by size, largest first, as ``C1`` … ``Ck``.
+``get_clusters()`` caches labels and centres per feature-data hash and k in
+memory and under ``models/``. ``sweep()`` fits a range of k on a row sample
+and reports inertia and silhouette for choosing k.
+
+``python clustering.py [csv] [--k 5] [--sweep 2 10]`` streams the CSV, fits and
+prints the cluster profiles (or the sweep) with timings.
+"""
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+MODEL_DIR = "models"
+FEATURES = ["CreditScore", "Age", "Tenure", "Balance", "NumOfProducts",
+            "EstimatedSalary", "IsActiveMember"]
+DEFAULT_K = 5
+K_RANGE = range(2, 11)
+CHUNK_ROWS = 250_000
+BATCH_ROWS = 4096
+EPOCHS = 2
+SWEEP_ROWS = 100_000
+SILHOUETTE_ROWS = 5_000
+
+_cache = {}
+_locks = {}  # one per cache key, so a fit only blocks callers of the same key
+_lock = threading.Lock()  # guards _locks
+
+
+def chunks(source, columns=FEATURES, chunk_rows=CHUNK_ROWS):
+    """``columns`` of a DataFrame or CSV path, ``chunk_rows`` rows at a time."""
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunk_rows):
+            yield source.iloc[start:start + chunk_rows][columns]
+    else:
+        yield from pd.read_csv(source, usecols=columns, chunksize=chunk_rows)
+
+
+def _matrix(chunk):
+    return chunk[FEATURES].to_numpy(dtype=np.float64)
+
+
+class Scaler:
+    """Per-feature mean and standard deviation, merged chunk by chunk (Chan et al.)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = np.zeros(len(FEATURES))
+        self._m2 = np.zeros(len(FEATURES))
+
+    def add(self, X):
+        n, mean = len(X), X.mean(axis=0)
+        m2 = ((X - mean) ** 2).sum(axis=0)
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * n / total
+        self._m2 = self._m2 + m2 + delta ** 2 * self.n * n / total
+        self.n = total
+
+    @property
+    def scale(self):
+        std = np.sqrt(self._m2 / max(self.n, 1))
+        return np.where(std > 0, std, 1.0)
+
+    def transform(self, X):
+        return ((X - self.mean) / self.scale).astype(np.float32)
+
+    @classmethod
+    def fit(cls, source, chunk_rows=CHUNK_ROWS):
+        scaler = cls()
+        for chunk in chunks(source, chunk_rows=chunk_rows):
+            scaler.add(_matrix(chunk))
+        return scaler
+
+
+class ClusterModel:
+    """Cluster centres in standardised units, with the scaler that defines them."""
+
+    def __init__(self, centers, mean, scale):
+        self.centers = np.asarray(centers, dtype=np.float32)
+        self.mean = np.asarray(mean)
+        self.scale = np.asarray(scale)
+
+    @property
+    def k(self):
+        return len(self.centers)
+
+    def predict(self, X):
+        """Nearest centre of every row of the raw feature matrix ``X``."""
+        Z = ((X - self.mean) / self.scale).astype(np.float32)
+        d = (self.centers ** 2).sum(axis=1) - 2 * Z @ self.centers.T
+        return d.argmin(axis=1).astype(np.int8)
+
+    def inertia(self, X):
+        """Mean squared standardised distance of ``X``'s rows to their centres."""
+        Z = ((X - self.mean) / self.scale).astype(np.float32)
+        d = (Z ** 2).sum(axis=1)[:, None] + (self.centers ** 2).sum(axis=1) - 2 * Z @ self.centers.T
+        return float(np.maximum(d.min(axis=1), 0).mean())
+
+
+def _kmeans(k, seed, **kwargs):
+    from sklearn.cluster import MiniBatchKMeans
+    return MiniBatchKMeans(n_clusters=k, batch_size=BATCH_ROWS, n_init=3,
+                           random_state=seed, **kwargs)
+
+
+def fit(source, k=DEFAULT_K, seed=0, epochs=EPOCHS, chunk_rows=CHUNK_ROWS, scaler=None):
+    """Mini-batch k-means over standardised chunks of ``source``; clusters unordered."""
+    scaler = scaler or Scaler.fit(source, chunk_rows)
+    km = _kmeans(k, seed)
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        for chunk in chunks(source, chunk_rows=chunk_rows):
+            Z = scaler.transform(_matrix(chunk))[rng.permutation(len(chunk))]
+            for start in range(0, len(Z), BATCH_ROWS):
+                batch = Z[start:start + BATCH_ROWS]
+                if len(batch) >= k:
+                    km.partial_fit(batch)
+    return ClusterModel(km.cluster_centers_, scaler.mean, scaler.scale)
+
+
+def assign(model, source, chunk_rows=CHUNK_ROWS):
+    """Cluster index (int8) of every row of ``source``."""
+    parts = [model.predict(_matrix(chunk)) for chunk in chunks(source, chunk_rows=chunk_rows)]
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int8)
+
+
+def by_size(model, labels):
+    """Renumber clusters largest first; returns the reordered model and labels."""
+    order = np.argsort(-np.bincount(labels, minlength=model.k), kind="stable")
+    rank = np.empty(model.k, dtype=np.int8)
+    rank[order] = np.arange(model.k)
+    return ClusterModel(model.centers[order], model.mean, model.scale), rank[labels]
+
+
+def names(k):
+    return [f"C{i + 1}" for i in range(k)]
+
+
+def as_category(labels, k):
+    return pd.Categorical.from_codes(labels, categories=names(k))
+
+
+# ── Cached assignments ────────────────────────────────────────────────────────
+def data_hash(df):
+    """Content hash of the clustering features, independent of dtype widths."""
+    cols = df[FEATURES].astype(np.float64)
+    row_hashes = pd.util.hash_pandas_object(cols, index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()[:16]
+
+
+def get_clusters(df, k=DEFAULT_K, model_dir=MODEL_DIR, seed=0):
+    """``(labels, model)`` of ``df``'s k clusters: memory, then disk, then fit."""
+    digest = data_hash(df)
+    key = (digest, k, seed)
+    with _lock:
+        key_lock = _locks.setdefault(key, threading.Lock())
+    with key_lock:
+        if key in _cache:
+            return _cache[key]
+        path = os.path.join(model_dir, f"clusters-{digest}-k{k}-s{seed}.npz")
+        if os.path.exists(path):
+            with np.load(path) as f:
+                model = ClusterModel(f["centers"], f["mean"], f["scale"])
+                labels = f["labels"]
+        else:
+            model = fit(df, k, seed)
+            model, labels = by_size(model, assign(model, df))
+            os.makedirs(model_dir, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                np.savez(f, labels=labels, centers=model.centers,
+                         mean=model.mean, scale=model.scale)
+            os.replace(path + ".tmp", path)
+        _cache[key] = result = (labels, model)
+        return result
+
+
+# ── Choosing k ────────────────────────────────────────────────────────────────
+def sample(source, rows=SWEEP_ROWS, seed=0, scaler=None):
+    """``(raw feature sample, scaler)``: about ``rows`` rows drawn evenly across chunks."""
+    scaler = scaler or Scaler.fit(source)
+    rng = np.random.default_rng(seed)
+    frac = min(1.0, rows / max(scaler.n, 1))
+    parts = []
+    for chunk in chunks(source):
+        X = _matrix(chunk)
+        parts.append(X[rng.random(len(X)) < frac])
+    return np.concatenate(parts), scaler
+
+
+def sweep(source, ks=K_RANGE, rows=SWEEP_ROWS, seed=0):
+    """Inertia (mean squared standardised distance) and silhouette per k, on a sample."""
+    from sklearn.metrics import silhouette_score
+
+    X, scaler = sample(source, rows, seed)
+    Z = scaler.transform(X)
+    sil = np.random.default_rng(seed).permutation(len(X))[:SILHOUETTE_ROWS]
+    out = []
+    for k in ks:
+        t0 = time.perf_counter()
+        km = _kmeans(k, seed, max_iter=50).fit(Z)
+        model = ClusterModel(km.cluster_centers_, scaler.mean, scaler.scale)
+        out.append({"k": k, "Inertia": round(model.inertia(X), 4),
+                    "Silhouette": round(float(silhouette_score(Z[sil], km.labels_[sil])), 4),
+                    "Fit (s)": round(time.perf_counter() - t0, 2)})
+    return pd.DataFrame(out)
+
+
+# ── Profiles ──────────────────────────────────────────────────────────────────
+def profile(source, labels, k):
+    """Per cluster: customers, churn rate (%) and mean of each feature, streamed."""
+    counts = np.zeros(k)
+    churned = np.zeros(k)
+    sums = np.zeros((k, len(FEATURES)))
+    start = 0
+    for chunk in chunks(source, FEATURES + ["Exited"]):
+        lab = labels[start:start + len(chunk)]
+        start += len(chunk)
+        counts += np.bincount(lab, minlength=k)
+        churned += np.bincount(lab, weights=chunk["Exited"].to_numpy(np.float64), minlength=k)
+        X = _matrix(chunk)
+        for j in range(len(FEATURES)):
+            sums[:, j] += np.bincount(lab, weights=X[:, j], minlength=k)
+    n = np.maximum(counts, 1)
+    out = pd.DataFrame(sums / n[:, None], columns=[f"Avg {c}" for c in FEATURES]).round(1)
+    out.insert(0, "Cluster", names(k))
+    out.insert(1, "Customers", counts.astype(np.int64))
+    out.insert(2, "Churn Rate (%)", (churned / n * 100).round(1))
+    out["Avg IsActiveMember"] = (sums[:, FEATURES.index("IsActiveMember")] / n * 100).round(1)
+    return out.rename(columns={"Avg IsActiveMember": "Active (%)"})
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import churn_data
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=churn_data.DATA_PATH)
+    parser.add_argument("--k", type=int, default=DEFAULT_K)
+    parser.add_argument("--sweep", type=int, nargs=2, metavar=("FROM", "TO"))
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pd.set_option("display.width", 200)
+    t0 = time.perf_counter()
+    if args.sweep:
+        print(sweep(args.csv, range(args.sweep[0], args.sweep[1] + 1), seed=args.seed)
+              .to_string(index=False))
+        print(f"sweep in {time.perf_counter() - t0:.1f}s")
+        raise SystemExit
+
+    scaler = Scaler.fit(args.csv, args.chunk_rows)
+    model = fit(args.csv, args.k, args.seed, chunk_rows=args.chunk_rows, scaler=scaler)
+    t_fit = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    model, labels = by_size(model, assign(model, args.csv, args.chunk_rows))
+    t_assign = time.perf_counter() - t0
+    print(profile(args.csv, labels, model.k).to_string(index=False))
+    print(f"{scaler.n:,} rows · fit {t_fit:.1f}s ({EPOCHS} epochs of {BATCH_ROWS}-row batches) · "
+          f"assign {t_assign:.1f}s · inertia {model.inertia(sample(args.csv, scaler=scaler)[0]):.3f}")
@@ -0,0 +1,111 @@
+"""Columnar on-disk store of the banded customer table.
+
+``python columnar_store.py [csv] [store_dir]`` parses the CSV once through
+``churn_data.load_data()`` and writes one ``.npy`` file per column: numeric
+columns as-is, categoricals (including the derived AgeGroup / CreditBand /
+TenureGroup / BalanceSeg bands) as their integer codes, with the category
+labels kept in ``meta.json``.
+
+``load()`` memory-maps those files read-only, so every Streamlit worker on the
+host shares the same page-cache pages instead of holding a private parsed
+copy. When the store is missing, was written by another format version, or is
+older than the CSV, it falls back to parsing the CSV.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import churn_data
+
+FORMAT_VERSION = 1
+
+
+def default_store_dir(csv_path=churn_data.DATA_PATH):
+    return os.path.splitext(csv_path)[0] + ".store"
+
+
+def _source_stamp(csv_path):
+    st = os.stat(csv_path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def ingest(csv_path=churn_data.DATA_PATH, store_dir=None):
+    """Parse ``csv_path`` and (re)write its columnar store. Returns the store dir."""
+    store_dir = store_dir or default_store_dir(csv_path)
+    stamp = _source_stamp(csv_path)
+    df = churn_data.load_data(csv_path)
+
+    # Build next to the target and swap in, so readers never see a half-written store.
+    tmp_dir = store_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        entry = {"name": name}
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), col.cat.codes.to_numpy())
+            entry["categories"] = col.cat.categories.tolist()
+            entry["ordered"] = bool(col.cat.ordered)
+        else:
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), col.to_numpy())
+        columns.append(entry)
+
+    meta = {"version": FORMAT_VERSION, "rows": len(df), "source": stamp, "columns": columns}
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=1)
+
+    shutil.rmtree(store_dir, ignore_errors=True)
+    os.replace(tmp_dir, store_dir)
+    return store_dir
+
+
+def read_meta(store_dir):
+    try:
+        with open(os.path.join(store_dir, "meta.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(csv_path, store_dir):
+    """True when ``store_dir`` was ingested from the current ``csv_path``."""
+    meta = read_meta(store_dir)
+    if meta is None or meta.get("version") != FORMAT_VERSION:
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return meta["source"] == _source_stamp(csv_path)
+
+
+def load_store(store_dir):
+    """Memory-map a store into a DataFrame without copying the column data."""
+    meta = read_meta(store_dir)
+    data = {}
+    for entry in meta["columns"]:
+        arr = np.load(os.path.join(store_dir, f"{entry['name']}.npy"), mmap_mode="r")
+        if "categories" in entry:
+            arr = pd.Categorical.from_codes(
+                arr, categories=entry["categories"], ordered=entry["ordered"])
+        data[entry["name"]] = arr
+    return pd.DataFrame(data, copy=False)
+
+
+def load(csv_path=churn_data.DATA_PATH, store_dir=None):
+    """Customer table from the columnar store when fresh, else from the CSV."""
+    store_dir = store_dir or default_store_dir(csv_path)
+    if is_fresh(csv_path, store_dir):
+        return load_store(store_dir)
+    return churn_data.load_data(csv_path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    csv_path  = sys.argv[1] if len(sys.argv) > 1 else churn_data.DATA_PATH
+    store_dir = sys.argv[2] if len(sys.argv) > 2 else None
+    out = ingest(csv_path, store_dir)
+    print(f"{csv_path} → {out} ({read_meta(out)['rows']:,} rows)")
@@ -0,0 +1,711 @@
+import collections
+import html
+import json
+import os
+
+import streamlit as st
+
+import charts
+import churn_core
+import churn_data
+import perf_trace
+from charts import ACCENT, BLUE, GOLD, GREEN, LIGHT, SIG_CARDS, sig_colors
+from churn_core import CI_COLS, CLUSTER_DIM, DIMENSIONS, EXPLORER_DIMENSIONS
+from figure_cache import FigureCache
+
+# ── Page config ──────────────────────────────────────────────────────────────
+st.set_page_config(
+    page_title="Bank Churn Segmentation",
+    page_icon="🏦",
+    layout="wide"
+)
+
+# ── Performance tracing ───────────────────────────────────────────────────────
+# The "⏱ Performance" toggle is hidden unless CHURN_PERF=1 or the URL carries
+# ?perf=1. While it is off the tracer is disabled: span() is a shared no-op
+# and wrap() hands back the modules themselves.
+PERF_PANEL = os.environ.get("CHURN_PERF") == "1" or st.query_params.get("perf") == "1"
+tracer = perf_trace.Tracer(enabled=PERF_PANEL and st.session_state.get("perf_on", False))
+span   = tracer.span
+core   = tracer.wrap(churn_core, "core")
+charts = tracer.wrap(charts)
+
+# ── Custom CSS ────────────────────────────────────────────────────────────────
+st.markdown("""
+<style>
+    .main { background-color: #F8FAFB; }
+    [data-testid="stSidebar"] { background-color: #1F4E79; }
+    [data-testid="stSidebar"] * { color: white !important; }
+    [data-testid="stSidebar"] .stSelectbox label,
+    [data-testid="stSidebar"] .stMultiSelect label { color: white !important; }
+    .metric-card {
+        background: white;
+        border-radius: 12px;
+        padding: 20px 24px;
+        box-shadow: 0 2px 8px rgba(0,0,0,0.08);
+        border-left: 5px solid #1F4E79;
+        margin-bottom: 10px;
+    }
+    .metric-card h2 { margin: 0; font-size: 2rem; color: #1F4E79; }
+    .metric-card p  { margin: 4px 0 0; color: #555; font-size: 0.9rem; }
+    .red-card  { border-left-color: #E74C3C !important; }
+    .red-card h2 { color: #E74C3C !important; }
+    .green-card { border-left-color: #27AE60 !important; }
+    .green-card h2 { color: #27AE60 !important; }
+    .gold-card  { border-left-color: #F39C12 !important; }
+    .gold-card h2 { color: #F39C12 !important; }
+    .section-title {
+        font-size: 1.3rem; font-weight: 700;
+        color: #1F4E79; margin: 24px 0 12px;
+        border-bottom: 2px solid #2E75B6;
+        padding-bottom: 6px;
+    }
+    .insight-box {
+        background: #EBF3FB; border-left: 4px solid #2E75B6;
+        border-radius: 8px; padding: 12px 16px;
+        margin: 12px 0; color: #1F4E79; font-size: 0.92rem;
+    }
+    .warning-box {
+        background: #FDECEA; border-left: 4px solid #E74C3C;
+        border-radius: 8px; padding: 12px 16px;
+        margin: 12px 0; color: #922B21; font-size: 0.92rem;
+    }
+    .stPlotlyChart, .element-container { margin-bottom: 0 !important; }
+</style>
+""", unsafe_allow_html=True)
+
+# ── Load & prepare data ───────────────────────────────────────────────────────
+# All data and tables come from churn_core; this script only caches, lays out
+# and draws them. cache_resource hands every session the same frame, so the
+# memory-mapped columns of the columnar store (python columnar_store.py) are
+# shared rather than copied per session. The frame is treated as read-only.
+@st.cache_resource
+def load_data():
+    return core.load_data()
+
+# Custom band edges re-bin the parsed table in memory: sorted source columns
+# and each band's column per edge set are cached by the shared Rebinner, so an
+# edit only recomputes the band that changed (and the cube built from it).
+@st.cache_resource
+def rebinner():
+    return churn_data.Rebinner(load_data())
+
+def band_spec(bands_key):
+    return {band: (churn_data.BANDS[band][0], list(bins), list(labels))
+            for band, bins, labels in bands_key}
+
+@st.cache_resource(max_entries=8)
+def banded_data(bands_key):
+    return rebinner().apply(band_spec(bands_key))
+
+@st.cache_data(max_entries=16)
+def load_cube(bands_key):
+    return core.load_cube(banded_data(bands_key))
+
+# Churn probabilities for every row of load_data()'s frame; the model is trained
+# once per training-data hash and persisted under models/.
+@st.cache_resource
+def load_scores():
+    return core.load_scores(load_data())
+
+# Customer drill-down: per-segment row indexes of the banded frame, and model
+# risk as a sort key (same rows, so the scores of load_data()'s frame apply).
+@st.cache_resource(max_entries=8)
+def drill_index(bands_key, k=None):
+    return core.load_index(clustered_data(bands_key, k) if k else banded_data(bands_key))
+
+@st.cache_resource
+def risk_percent():
+    return (load_scores()[0].astype("float64") * 100).round(1)
+
+# Behavioural clusters: a clustered copy of the banded frame per k (assignments
+# cached under models/), with its own cube and Year cubes carrying Cluster.
+@st.cache_resource(max_entries=4)
+def clustered_data(bands_key, k):
+    return core.load_clusters(banded_data(bands_key), k)
+
+@st.cache_data(max_entries=8)
+def cluster_cube(bands_key, k):
+    return core.load_cube(clustered_data(bands_key, k))
+
+@st.cache_resource(max_entries=4)
+def cluster_years(bands_key, k):
+    return core.load_years(df=clustered_data(bands_key, k))
+
+@st.cache_data
+def cluster_sweep(stamp):
+    return core.cluster_sweep(load_data())
+
+# Per-Year aggregates are refreshed incrementally whenever the CSV changes.
+@st.cache_resource
+def load_years(stamp):
+    return core.load_years()
+
+@st.cache_resource(max_entries=8)
+def banded_years(bands_key):
+    return core.load_years(df=banded_data(bands_key))
+
+_st   = os.stat(churn_data.DATA_PATH)
+data_stamp = (_st.st_size, _st.st_mtime_ns)
+with span("load years"):
+    years = load_years(data_stamp)
+
+# Rendered chart PNGs, shared by all sessions of this server process.
+@st.cache_resource
+def figure_cache():
+    return FigureCache(maxsize=256)
+
+fig_cache = figure_cache()
+
+def band_input(band, default):
+    """Sidebar edges for ``band``; falls back to ``default`` on invalid input."""
+    src, bins, labels = default
+    text = st.text_input(f"{band} ({src})", ", ".join(f"{b:g}" for b in bins))
+    try:
+        try:
+            edges = [float(x) for x in text.split(",")]
+        except ValueError:
+            raise ValueError(f"{band}: edges must be comma-separated numbers") from None
+        return default if edges == bins else churn_data.make_band(band, edges)
+    except ValueError as e:
+        st.error(f"{e}; using {', '.join(f'{b:g}' for b in bins)}.")
+        return default
+
+# ── Sidebar navigation & filters ─────────────────────────────────────────────
+with st.sidebar, span("sidebar"):
+    st.markdown("## 🏦 Navigation")
+    page = st.radio("", [
+        "📊 Overview Dashboard",
+        "🌍 Geographic Analysis",
+        "👥 Demographic Analysis",
+        "💰 Financial Segmentation",
+        "🔍 Segment Explorer",
+        "🎯 Risk Scores"
+    ])
+    st.markdown("---")
+    st.markdown("## ⚙️ Filters")
+    # bands.json (if present) sets the default edges; the inputs override them.
+    with st.expander("📐 Band edges"):
+        bands = {band: band_input(band, default)
+                 for band, default in churn_data.load_bands().items()}
+    age_groups  = bands["AgeGroup"][2]
+    year_filter = st.selectbox("Year", ["All years"] + years.years[::-1])
+    geo_filter  = st.multiselect("Country", core.GEOGRAPHIES, default=core.GEOGRAPHIES)
+    gen_filter  = st.multiselect("Gender",  core.GENDERS, default=core.GENDERS)
+    age_filter  = st.multiselect("Age Group", age_groups, default=age_groups)
+    st.markdown("---")
+    fig_cache_stats = st.empty()
+    st.markdown("---")
+    st.markdown("**M. Anjali**  \nFinancial Analyst Intern  \nUnified Mentor × ECB  \nFebruary 2026")
+
+# Apply filters — aggregates come from the cube slice; row-level filtering is
+# only done where a page needs the raw rows (high-value balance quantile).
+bands_key    = tuple((band, tuple(bins), tuple(labels)) for band, (src, bins, labels) in bands.items())
+custom_bands = bands != churn_data.BANDS
+with span("load table"):
+    df = banded_data(bands_key)
+with span("load cube"):
+    cube = load_cube(bands_key)
+if custom_bands:
+    with span("load years"):
+        years = banded_years(bands_key)
+
+all_years = year_filter == "All years"
+year  = None if all_years else year_filter
+# With CHURN_QUERY_URL set, the filtered cube comes from the shared query
+# service (python query_service.py), so identical views across sessions and
+# server processes are computed once. The service only knows the default bands;
+# if it is unreachable or fails, the view is filtered locally as without it.
+QUERY_URL = os.environ.get("CHURN_QUERY_URL")
+with span("filter"):
+    fcube = None
+    if QUERY_URL and not custom_bands:
+        import query_service
+        try:
+            fcube = query_service.fetch_cube(QUERY_URL, geo_filter, gen_filter, age_filter, year)
+        except (OSError, ValueError) as e:
+            st.warning(f"Query service at {QUERY_URL} unavailable ({e}); filtering locally.")
+    if fcube is None:
+        fcube = core.filter_cube(cube, geo_filter, gen_filter, age_filter, year, years)
+
+# Everything a chart's pixels depend on besides the page, chart and dimensions.
+view_key = (data_stamp, bands_key, year_filter, tuple(sorted(geo_filter)),
+            tuple(sorted(gen_filter)), tuple(sorted(age_filter)))
+
+def row_mask(df):
+    return core.row_mask(df, geo_filter, gen_filter, age_filter, year)
+
+# ── Helper functions ──────────────────────────────────────────────────────────
+def kpi_card(col, value, label, card_class=""):
+    with span("emit kpi"):
+        col.markdown(f"""
+    <div class="metric-card {card_class}">
+        <h2>{value}</h2>
+        <p>{label}</p>
+    </div>""", unsafe_allow_html=True)
+
+def show_table(data):
+    with span("emit table"):
+        st.dataframe(data, use_container_width=True, hide_index=True)
+
+# ── Segment significance ──────────────────────────────────────────────────────
+def sig_segments(tbl, dim, rate_scale=1, label="{}"):
+    """``(vs Baseline, text)`` of each segment of a ``churn_core`` table that churns
+    significantly above or below the rest of the view."""
+    rows = tbl if dim in tbl.columns else tbl.reset_index()
+    return [(sig, f"<b>{html.escape(label.format(seg))}</b> at {rate*rate_scale:.1f}% (95% CI {lo}–{hi}%)")
+            for seg, rate, lo, hi, sig in zip(rows[dim], rows["ChurnRate"], rows["CI Low (%)"],
+                                              rows["CI High (%)"], rows["vs Baseline"])
+            if sig in SIG_CARDS]
+
+def insight_box(title, findings, note=""):
+    """Warning box when some segment churns significantly higher, else an insight box."""
+    higher = [text for sig, text in findings if sig == "▲ higher"]
+    lower  = [text for sig, text in findings if sig == "▼ lower"]
+    text   = " ".join(
+        [f"Significantly higher churn than the rest of the view: {', '.join(higher)}."] * bool(higher) +
+        [f"Significantly lower: {', '.join(lower)}."] * bool(lower)
+    ) or "No segment's churn differs significantly from the rest of the view."
+    box, icon = ("warning-box", "🚨") if higher else ("insight-box", "💡")
+    st.markdown(f"<div class='{box}'>{icon} <b>{title}:</b> {text} {note}</div>",
+                unsafe_allow_html=True)
+
+def show_figure(chart_id, draw, *dims):
+    """Send the chart from the figure cache, calling ``draw()`` only on a miss."""
+    with span(f"figure {chart_id}"):
+        png = fig_cache.get((page, chart_id, view_key) + dims, draw)
+    with span("emit image"):
+        st.image(png, use_container_width=True)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PAGE 1 — OVERVIEW DASHBOARD
+# ══════════════════════════════════════════════════════════════════════════════
+if page == "📊 Overview Dashboard":
+    st.markdown(f"<h1 style='color:{BLUE}'>📊 Churn Overview Dashboard</h1>", unsafe_allow_html=True)
+    st.markdown("Customer Segmentation & Churn Pattern Analytics — European Banking")
+    st.markdown("---")
+
+    kpis       = core.overview(fcube)
+    total, churned, retained = kpis["Customers"], kpis["Churned"], kpis["Retained"]
+    churn_rate = kpis["Churn Rate (%)"]
+
+    c1,c2,c3,c4 = st.columns(4)
+    kpi_card(c1, f"{total:,}", "Total Customers")
+    kpi_card(c2, f"{churned:,}", "Churned Customers", "red-card")
+    kpi_card(c3, f"{retained:,}", "Retained Customers", "green-card")
+    kpi_card(c4, f"{churn_rate:.1f}%", "Overall Churn Rate", "gold-card")
+
+    st.markdown("<div class='section-title'>Churn Distribution by Segment</div>", unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        show_figure("retained_churned_pie", lambda: charts.donut(retained, churned))
+
+    with col2:
+        geo_tbl   = core.segment_table(fcube, "Geography")
+        geo_churn = geo_tbl["ChurnRate"]*100
+        show_figure("geo_churn_bar", lambda: charts.churn_bars(
+            geo_churn.index.tolist(), geo_churn.values.tolist(),
+            sig_colors(geo_tbl), "Churn Rate by Country"))
+
+    col3, col4 = st.columns(2)
+
+    with col3:
+        age_tbl   = core.segment_table(fcube, "AgeGroup")
+        age_churn = age_tbl["ChurnRate"]*100
+        show_figure("age_churn_bar", lambda: charts.churn_bars(
+            age_churn.index.tolist(), age_churn.values.tolist(),
+            sig_colors(age_tbl), "Churn Rate by Age Group"))
+
+    with col4:
+        prod_tbl   = core.segment_table(fcube, "NumOfProducts")
+        prod_churn = prod_tbl["ChurnRate"]*100
+        show_figure("products_churn_bar", lambda: charts.churn_bars(
+            [f"{i} Product(s)" for i in prod_churn.index],
+            prod_churn.values.tolist(), sig_colors(prod_tbl), "Churn Rate by Products Held"))
+
+    insight_box("Key Takeaway",
+                sig_segments(geo_tbl, "Geography", 100) + sig_segments(age_tbl, "AgeGroup", 100) +
+                sig_segments(prod_tbl, "NumOfProducts", 100, "{} product(s)"))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PAGE 2 — GEOGRAPHIC ANALYSIS
+# ══════════════════════════════════════════════════════════════════════════════
+elif page == "🌍 Geographic Analysis":
+    st.markdown(f"<h1 style='color:{BLUE}'>🌍 Geographic Churn Analysis</h1>", unsafe_allow_html=True)
+    st.markdown("---")
+
+    geo_stats = core.geo_stats(fcube)
+
+    c1,c2,c3 = st.columns(3)
+    for col, row, lo, hi, sig in zip([c1,c2,c3], geo_stats.itertuples(), geo_stats["CI Low (%)"],
+                                     geo_stats["CI High (%)"], geo_stats["vs Baseline"]):
+        card_class = SIG_CARDS.get(sig, "")
+        col.markdown(f"""
+        <div class='metric-card {card_class}'>
+            <h2>{row.ChurnRate}%</h2>
+            <p><b>{row.Geography}</b> — {row.Customers:,} customers<br>
+            {row.Churned:,} churned · Avg balance €{row.AvgBalance:,}<br>
+            95% CI {lo}–{hi}% · {sig}</p>
+        </div>""", unsafe_allow_html=True)
+
+    st.markdown("<div class='section-title'>Churn Breakdown by Country</div>", unsafe_allow_html=True)
+    col1, col2 = st.columns(2)
+
+    with col1:
+        show_figure("geo_churn_bar", lambda: charts.churn_bars(
+            geo_stats["Geography"].tolist(), geo_stats["ChurnRate"].tolist(),
+            sig_colors(geo_stats), "Churn Rate by Country", figsize=(6,4)))
+
+    with col2:
+        show_figure("geo_churned_retained", lambda: charts.paired_bars(
+            geo_stats["Geography"],
+            {"Retained": (geo_stats["Customers"]-geo_stats["Churned"], GREEN),
+             "Churned":  (geo_stats["Churned"], ACCENT)},
+            "Churned vs Retained by Country"))
+
+    st.markdown("<div class='section-title'>Geography × Age Group Churn Heatmap</div>", unsafe_allow_html=True)
+    pivot = core.pivot(fcube, "Geography", "AgeGroup")
+    show_figure("geo_age_heatmap", lambda: charts.heatmap(
+        pivot, "Churn Rate (%) — Geography × Age Group"))
+
+    insight_box("Geographic Alert", sig_segments(geo_stats, "Geography"))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PAGE 3 — DEMOGRAPHIC ANALYSIS
+# ══════════════════════════════════════════════════════════════════════════════
+elif page == "👥 Demographic Analysis":
+    st.markdown(f"<h1 style='color:{BLUE}'>👥 Demographic Churn Analysis</h1>", unsafe_allow_html=True)
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("<div class='section-title'>Churn by Age Group</div>", unsafe_allow_html=True)
+        age_data = core.age_table(fcube)
+        show_figure("age_churn_bar", lambda: charts.churn_bars(
+            age_data["AgeGroup"].tolist(), age_data["ChurnRate"].tolist(),
+            sig_colors(age_data), "Churn Rate by Age Group", figsize=(6,4)))
+        show_table(age_data.rename(columns={"AgeGroup":"Age Group","ChurnRate":"Churn Rate (%)"}))
+
+    with col2:
+        st.markdown("<div class='section-title'>Churn by Gender</div>", unsafe_allow_html=True)
+        gen_data = core.gender_table(fcube)
+        show_figure("gender_churn_bar", lambda: charts.churn_bars(
+            gen_data["Gender"].tolist(), gen_data["ChurnRate"].tolist(),
+            sig_colors(gen_data), "Churn Rate by Gender", figsize=(6,4)))
+        show_table(gen_data.rename(columns={"ChurnRate":"Churn Rate (%)"}))
+
+    st.markdown("<div class='section-title'>Active vs Inactive Members</div>", unsafe_allow_html=True)
+    col3, col4 = st.columns(2)
+
+    with col3:
+        act_data = core.activity_table(fcube)
+        show_figure("active_churn_bar", lambda: charts.churn_bars(
+            act_data["Label"].tolist(), act_data["ChurnRate"].tolist(),
+            sig_colors(act_data), "Churn Rate: Active vs Inactive"))
+
+    with col4:
+        st.markdown("<div class='section-title'>Gender × Geography Churn</div>", unsafe_allow_html=True)
+        gg = core.pivot(fcube, "Geography", "Gender")
+        show_figure("geo_gender_bar", lambda: charts.paired_bars(
+            gg.index, {"Female": (gg["Female"], ACCENT), "Male": (gg["Male"], LIGHT)},
+            "Churn Rate by Country & Gender", figsize=(5,4), title_size=12,
+            ylabel="Churn Rate (%)"))
+
+    insight_box("Demographic Insight",
+                sig_segments(age_data, "AgeGroup") + sig_segments(gen_data, "Gender") +
+                sig_segments(act_data, "Label", label="{} members"))
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PAGE 4 — FINANCIAL SEGMENTATION
+# ══════════════════════════════════════════════════════════════════════════════
+elif page == "💰 Financial Segmentation":
+    st.markdown(f"<h1 style='color:{BLUE}'>💰 Financial Segmentation Analysis</h1>", unsafe_allow_html=True)
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("<div class='section-title'>Churn by Number of Products</div>", unsafe_allow_html=True)
+        prod_data = core.product_table(fcube)
+        show_figure("products_churn_bar", lambda: charts.churn_bars(
+            [f"{p} Products" for p in prod_data["NumOfProducts"]],
+            prod_data["ChurnRate"].tolist(), sig_colors(prod_data), "Churn Rate by Products Held",
+            figsize=(6,4)))
+        show_table(prod_data.rename(columns={"NumOfProducts":"Products","ChurnRate":"Churn Rate (%)"}))
+
+    with col2:
+        st.markdown("<div class='section-title'>Churn by Balance Segment</div>", unsafe_allow_html=True)
+        bal_data = core.balance_table(fcube)
+        show_figure("balance_churn_bar", lambda: charts.churn_bars(
+            bal_data["BalanceSeg"].tolist(), bal_data["ChurnRate"].tolist(),
+            sig_colors(bal_data), "Churn Rate by Balance Segment", figsize=(6,4)))
+        show_table(bal_data.rename(columns={"BalanceSeg":"Balance Segment","ChurnRate":"Churn Rate (%)"}))
+
+    col3, col4 = st.columns(2)
+
+    with col3:
+        st.markdown("<div class='section-title'>Churn by Credit Score Band</div>", unsafe_allow_html=True)
+        cr_data = core.credit_table(fcube)
+        show_figure("credit_churn_bar", lambda: charts.churn_bars(
+            cr_data["CreditBand"].tolist(), cr_data["ChurnRate"].tolist(),
+            sig_colors(cr_data), "Churn Rate by Credit Score Band"))
+
+    with col4:
+        st.markdown("<div class='section-title'>High-Value Customer Churn</div>", unsafe_allow_html=True)
+        hv        = core.high_value(df, row_mask(df))
+        hv_churn  = hv["Churn Rate (%)"]
+        all_churn = core.overview(fcube)["Churn Rate (%)"]
+        show_figure("high_value_bar", lambda: charts.churn_bars(
+            ["All Customers","High-Value (Top 25%)"], [round(all_churn,1), round(hv_churn,1)],
+            [LIGHT, ACCENT], "High-Value vs Overall Churn Rate"))
+
+    total_assets_lost = hv["Assets Lost"]
+
+    insight_box("Financial Risk",
+                sig_segments(prod_data, "NumOfProducts", label="{} product(s)") +
+                sig_segments(bal_data, "BalanceSeg") + sig_segments(cr_data, "CreditBand"),
+                f"The top 25% of customers by balance churn at {hv_churn:.1f}% "
+                f"({'above' if hv_churn > all_churn else 'at or below'} the view's {all_churn:.1f}%); "
+                f"<b>€{total_assets_lost:,.0f}</b> in assets have left with them.")
+
+    # What-if: a campaign keeps an uncertain share of the targeted churners;
+    # simulated in vectorised batches over the in-memory Balance column.
+    st.markdown("<div class='section-title'>Retention What-If Simulator</div>", unsafe_allow_html=True)
+    if st.checkbox("Simulate a retention campaign on the churned customers"):
+        c1,c2,c3 = st.columns(3)
+        sim_dim    = c1.selectbox("Target segments by", list(DIMENSIONS.keys()),
+                                  index=list(DIMENSIONS).index("Products Held"))
+        options    = fcube[DIMENSIONS[sim_dim]].drop_duplicates().sort_values().tolist()
+        sim_values = c2.multiselect("Target segments", options, default=options)
+        hv_only    = c3.checkbox("High-value customers only (top 25% by balance)")
+        c1,c2,c3 = st.columns(3)
+        effect     = c1.slider("Churners kept by the campaign (%)", 0, 100, 25)
+        effect_sd  = c2.slider("Uncertainty of that effect (± points)", 0, 25, 5)
+        sims       = c3.select_slider("Simulations", [1_000, 5_000, 10_000, 20_000], value=10_000)
+
+        target = core.target_mask(df, row_mask(df), {DIMENSIONS[sim_dim]: sim_values},
+                                  0.75 if hv_only else None)
+        try:
+            with span("simulate"):
+                sim = core.simulate_retention(df, target, effect/100, effect_sd/100, sims)
+        except ValueError as e:
+            st.error(f"{e}.")
+        else:
+            summary = sim.summary()
+            assets  = summary.set_index("Outcome").loc["Assets Retained (€)"]
+            kept    = summary.set_index("Outcome").loc["Customers Retained"]
+            c1,c2,c3,c4 = st.columns(4)
+            kpi_card(c1, f"{sim.churners.customers:,}", "Churned Customers Targeted", "red-card")
+            kpi_card(c2, f"{kept['P50']:,.0f}", "Customers Retained (median)", "green-card")
+            kpi_card(c3, f"€{assets['P50']/1e6:,.1f}M", "Assets Retained (median)", "gold-card")
+            kpi_card(c4, f"€{assets['P5']/1e6:,.1f}M – €{assets['P95']/1e6:,.1f}M",
+                     "Assets Retained (90% interval)")
+
+            sim_key = (sim_dim, tuple(sim_values), hv_only, effect, effect_sd, sims)
+            col1, col2 = st.columns(2)
+            with col1:
+                show_figure("sim_customers_hist", lambda: charts.histogram(
+                    sim.customers, "Simulated Customers Retained", "Customers", GREEN), *sim_key)
+            with col2:
+                show_figure("sim_assets_hist", lambda: charts.histogram(
+                    sim.assets/1e6, "Simulated Assets Retained", "Balance (€M)", GOLD), *sim_key)
+            show_table(summary)
+            st.caption(f"{sims:,} simulations of €{sim.churners.assets:,.0f} in churned balances. "
+                       f"Each draws the campaign's effect from a Beta distribution "
+                       f"({effect}% ± {effect_sd} points), then which targeted churners stay.")
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PAGE 5 — SEGMENT EXPLORER
+# ══════════════════════════════════════════════════════════════════════════════
+elif page == "🔍 Segment Explorer":
+    st.markdown(f"<h1 style='color:{BLUE}'>🔍 Custom Segment Explorer</h1>", unsafe_allow_html=True)
+    st.markdown("Compare churn rates across any two dimensions interactively.")
+    st.markdown("---")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        dim1 = st.selectbox("Primary Dimension", list(EXPLORER_DIMENSIONS.keys()), index=0)
+    with col2:
+        dim2 = st.selectbox("Secondary Dimension (for heatmap)", list(EXPLORER_DIMENSIONS.keys()), index=1)
+    col_dim1, col_dim2 = EXPLORER_DIMENSIONS[dim1], EXPLORER_DIMENSIONS[dim2]
+
+    # Behavioural clusters are answered from the clustered table's cube.
+    xfcube, xyears, cluster_key = fcube, years, ()
+    if CLUSTER_DIM in (col_dim1, col_dim2):
+        from clustering import DEFAULT_K, K_RANGE
+        k = st.select_slider("Behavioural clusters (k)", options=list(K_RANGE), value=DEFAULT_K)
+        cluster_key = (k,)
+        with span("load clusters"):
+            xyears = cluster_years(bands_key, k)
+            xfcube = core.filter_cube(cluster_cube(bands_key, k), geo_filter, gen_filter,
+                                      age_filter, year, xyears)
+        with st.expander("Cluster profiles and choosing k"):
+            st.caption("Mini-batch k-means on the standardised CreditScore, Age, Tenure, Balance, "
+                       "NumOfProducts, EstimatedSalary and IsActiveMember; C1 is the largest cluster.")
+            dfc = clustered_data(bands_key, k)
+            show_table(core.cluster_profile(dfc, row_mask(dfc)))
+            if st.checkbox("Sweep the cluster count (fitted on a 100k-customer sample)"):
+                show_table(cluster_sweep(data_stamp))
+                st.caption("Lower inertia and higher silhouette are better; look for the elbow.")
+
+    col_a, col_b = st.columns(2)
+
+    with col_a:
+        seg1 = core.rate_table(xfcube, col_dim1)
+        seg1.columns = [dim1,"Customers","Churned","ChurnRate"]+CI_COLS
+        show_figure("dim1_churn_bar", lambda: charts.churn_bars(
+            seg1[dim1].astype(str).tolist(), seg1["ChurnRate"].tolist(),
+            sig_colors(seg1), f"Churn Rate by {dim1}", figsize=(6,4.5)), dim1, *cluster_key)
+
+        show_table(seg1.rename(columns={"ChurnRate":"Churn Rate (%)"}))
+
+    with col_b:
+        try:
+            pivot = core.pivot(xfcube, col_dim1, col_dim2)
+            show_figure("dim_heatmap", lambda: charts.heatmap(
+                pivot, f"Churn Rate: {dim1} × {dim2}", figsize=(6,4.5), annot_size=10,
+                title_size=12, xlabel=dim2, ylabel=dim1, xrotation=30), dim1, dim2, *cluster_key)
+        except Exception:
+            st.info("Select two different dimensions to view the heatmap.")
+
+    st.markdown("<div class='section-title'>Segment Summary</div>", unsafe_allow_html=True)
+    kpis      = core.overview(xfcube)
+    total, churn_pct = kpis["Customers"], kpis["Churn Rate (%)"]
+    highest   = seg1.loc[seg1["ChurnRate"].idxmax(), dim1]
+    high_rate = seg1["ChurnRate"].max()
+
+    c1,c2,c3 = st.columns(3)
+    kpi_card(c1, f"{total:,}", f"Customers in filtered view")
+    kpi_card(c2, f"{churn_pct:.1f}%", "Filtered Churn Rate", "gold-card")
+    kpi_card(c3, f"{highest} — {high_rate:.1f}%", f"Highest churn {dim1}", "red-card")
+
+    st.markdown("<div class='section-title'>Year-over-Year Change</div>", unsafe_allow_html=True)
+    yoy_year = years.years[-1] if all_years else year_filter
+    yoy = core.yoy(xyears, col_dim1, yoy_year, geo_filter, gen_filter, age_filter)
+    if yoy is None:
+        st.info(f"No year before {yoy_year} in the data to compare against.")
+    else:
+        yoy = yoy.reset_index().rename(columns={col_dim1: dim1})
+        show_table(yoy)
+
+    st.markdown("<div class='section-title'>Hot-Spot Scan</div>", unsafe_allow_html=True)
+    if st.checkbox("Scan all two- and three-way segments"):
+        c1,c2,c3 = st.columns(3)
+        min_support = c1.number_input("Minimum support (% of filtered customers)",
+                                      min_value=0.0, max_value=100.0, value=1.0, step=0.5)
+        max_order   = c2.selectbox("Combine up to", [2, 3], index=1,
+                                   format_func=lambda k: f"{k} dimensions")
+        top_n       = c3.number_input("Show top", min_value=5, max_value=500, value=25, step=5)
+        hot = core.hot_spots(fcube, max_order=max_order, min_support=min_support/100)
+        st.caption(f"{len(hot):,} segments above the support cutoff, ranked by lift "
+                   f"(segment churn rate ÷ filtered churn rate).")
+        show_table(hot.head(int(top_n)))
+
+    st.markdown("<div class='section-title'>Customer Drill-Down</div>", unsafe_allow_html=True)
+    if st.checkbox("List the customers behind a segment"):
+        from drilldown import PAGE_SIZE
+        RISK = "Churn Risk (%)"
+        with span("load index"):
+            index = drill_index(bands_key, *cluster_key)
+        values1 = xfcube[col_dim1].drop_duplicates().sort_values().tolist()
+        values2 = xfcube[col_dim2].drop_duplicates().sort_values().tolist()
+        c1,c2,c3,c4 = st.columns(4)
+        value1  = c1.selectbox(dim1, values1, index=values1.index(highest))
+        value2  = c2.selectbox(dim2, ["All"] + values2) if dim2 != dim1 else "All"
+        sort_by = c3.selectbox("Sort by", ["Balance", RISK, "CreditScore", "Age",
+                                           "EstimatedSalary", "Tenure"])
+        lowest  = c4.selectbox("Order", ["Highest first", "Lowest first"]) == "Lowest first"
+        if sort_by == RISK:
+            index.add_key(RISK, risk_percent())
+
+        segment = {col_dim1: value1}
+        if value2 != "All":
+            segment[col_dim2] = value2
+        cells   = index.select(geo_filter, gen_filter, age_filter, year, segment)
+        pages   = max(1, -(-index.count(cells) // PAGE_SIZE))
+        page_no = min(int(st.number_input(f"Page (of {pages:,})", min_value=1, value=1)), pages)
+        with span("drill-down page"):
+            customers, total = index.page(cells, page_no - 1, sort_by, lowest)
+        first = (page_no - 1) * PAGE_SIZE
+        st.caption(f"{total:,} customers in {dim1} = {value1}"
+                   + (f", {dim2} = {value2}" if value2 != "All" else "")
+                   + (f" · showing {first + 1:,}–{first + len(customers):,}" if total else ""))
+        show_table(customers)
+
+        customer_id = st.text_input("Look up a CustomerId")
+        if customer_id.strip():
+            try:
+                found = index.lookup(int(customer_id))
+            except ValueError:
+                found = None
+                st.error("A CustomerId is a whole number.")
+            if found is not None:
+                if len(found):
+                    show_table(index.frame(found))
+                else:
+                    st.info(f"No customer {customer_id.strip()} in the data.")
+
+# ══════════════════════════════════════════════════════════════════════════════
+# PAGE 6 — RISK SCORES
+# ══════════════════════════════════════════════════════════════════════════════
+elif page == "🎯 Risk Scores":
+    st.markdown(f"<h1 style='color:{BLUE}'>🎯 Customer Churn Risk Scores</h1>", unsafe_allow_html=True)
+    st.markdown("Predicted churn probability per customer, for targeting retention campaigns.")
+    st.markdown("---")
+
+    import churn_model
+    proba, model_meta = load_scores()
+    col1, col2 = st.columns(2)
+    with col1:
+        top_n = st.slider("Customers to list", min_value=10, max_value=1000, value=100, step=10)
+    with col2:
+        include_churned = st.checkbox("Include customers who have already churned", value=False)
+
+    mask = row_mask(df)
+    if not include_churned:
+        mask &= df["Exited"].to_numpy() == 0
+    in_view = proba[mask]
+
+    c1,c2,c3,c4 = st.columns(4)
+    kpi_card(c1, f"{len(in_view):,}", "Customers Scored in View")
+    kpi_card(c2, f"{in_view.mean()*100:.1f}%" if len(in_view) else "—", "Average Predicted Risk", "gold-card")
+    kpi_card(c3, f"{(in_view >= 0.5).sum():,}", "High Risk (≥ 50%)", "red-card")
+    kpi_card(c4, f"{model_meta['holdout_auc']:.3f}", "Model Hold-out AUC", "green-card")
+
+    st.markdown(f"<div class='section-title'>Top {top_n} At-Risk Customers</div>", unsafe_allow_html=True)
+    at_risk = churn_model.top_at_risk(df, proba, mask, n=top_n, include_churned=True)
+    show_table(at_risk)
+    st.caption(f"Model {model_meta['data_hash']} · trained on {model_meta['rows']:,} customers · "
+               f"scored {len(df):,} rows in {model_meta['score_seconds']:.2f}s "
+               f"on {model_meta['workers']} worker(s) "
+               f"({model_meta['rows_per_sec']:,.0f} rows/sec)")
+
+# ── Figure cache counters ─────────────────────────────────────────────────────
+_fc = fig_cache.stats()
+fig_cache_stats.caption(f"🖼 Figure cache: {_fc['hits']:,} hits · {_fc['misses']:,} misses · "
+                        f"{_fc['entries']}/{_fc['maxsize']} images ({_fc['bytes']/1e6:.1f} MB)")
+
+# ── Performance panel ─────────────────────────────────────────────────────────
+if PERF_PANEL:
+    st.sidebar.toggle("⏱ Performance", key="perf_on")
+if tracer.enabled:
+    total = tracer.elapsed()
+    stats = st.session_state.setdefault("perf_stats", perf_trace.SpanStats())
+    stats.add(tracer.spans, total)
+    history = st.session_state.setdefault("perf_history", collections.deque(maxlen=50))
+    history.append((stats.reruns, tracer.spans))
+    top_level = sum(end - start for _, start, end, depth in tracer.spans if depth == 0)
+
+    st.markdown("<div class='section-title'>⏱ Performance</div>", unsafe_allow_html=True)
+    st.caption(f"Rerun {stats.reruns}: {total*1e3:,.1f} ms in {len(tracer.spans)} spans · "
+               f"{(total - top_level)*1e3:,.1f} ms outside top-level spans (page layout)")
+    st.dataframe(perf_trace.breakdown(tracer.spans, total), use_container_width=True, hide_index=True)
+    st.caption(f"Cumulative over {stats.reruns} traced reruns "
+               f"(mean {stats.rerun_seconds / stats.reruns * 1e3:,.1f} ms per rerun)")
+    st.dataframe(stats.table(), use_container_width=True, hide_index=True)
+    st.download_button("Export trace (Chrome / Perfetto JSON)",
+                       json.dumps(perf_trace.chrome_trace(history)),
+                       file_name="churn-trace.json", mime="application/json")
@@ -0,0 +1,225 @@
+"""Customer-level drill-down: the rows behind a segment, a page at a time.
+
+``SegmentIndex`` groups the rows of the banded table once by Year and the
+cube dimensions. Each cell's row positions are kept contiguous and pre-sorted
+per sort key (a CSR layout: one permutation of the rows plus cell offsets), so
+a segment — any union of cells — is answered without touching the table:
+
+* its customer count is a sum over the selected cells;
+* page ``p`` of the segment sorted by a key takes at most ``(p + 1) × size``
+  leading rows of each selected cell's run and merges only those.
+
+Broad segments are paged from a table-wide sort of the key instead, skipping
+rows outside the segment, whenever that is expected to touch fewer rows.
+Sort permutations are built on first use of a key; ``add_key()`` registers
+external per-row values such as model churn risk. Both happen under a lock,
+so one index can be shared by concurrent dashboard sessions.
+
+CustomerId lookup is O(1): a direct-address table over the id range when ids
+are dense (as the bank's sequential ids are), else a hash index.
+
+``python drilldown.py [--csv F] [--geo ...] [--segment Geography=Germany ...]
+[--by Balance] [--page 0] [--id CUSTOMER_ID]`` prints one page and its timing.
+"""
+import threading
+
+import numpy as np
+import pandas as pd
+
+from churn_data import filter_mask
+from segment_cube import CUBE_DIMS
+
+PAGE_SIZE = 100
+# Direct-address the CustomerId range while it is at most this many slots per row.
+MAX_ID_SPREAD = 32
+CELL_DIMS = ["Year"] + CUBE_DIMS
+
+# Columns listed per customer, and the table columns it can be sorted by.
+COLUMNS = ["CustomerId", "Year", "Geography", "Gender", "Age", "CreditScore", "Tenure",
+           "Balance", "NumOfProducts", "HasCrCard", "IsActiveMember", "EstimatedSalary", "Exited"]
+SORT_KEYS = ["Balance", "CreditScore", "Age", "Tenure", "EstimatedSalary"]
+
+
+class SegmentIndex:
+    """Per-cell row-index lists of ``df`` (cells of ``dims``) for paging through segments."""
+
+    def __init__(self, df, dims=CELL_DIMS):
+        self.df = df
+        g = df.groupby(dims, observed=True, dropna=False)
+        self.cells = g.size().rename("Customers").reset_index()
+        self._cell = g.ngroup().to_numpy()
+        counts = self.cells["Customers"].to_numpy()
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._values = {}
+        self._orders = {}
+        self._sorted = {}
+        self._lock = threading.RLock()
+
+        ids = df["CustomerId"].to_numpy().astype(np.int64)
+        self._by_id = np.argsort(ids, kind="stable")
+        uniq, starts, n = np.unique(ids[self._by_id], return_index=True, return_counts=True)
+        self._id_starts, self._id_counts = starts, n
+        self._id_lo = int(uniq[0]) if len(uniq) else 0
+        span = int(uniq[-1]) - self._id_lo + 1 if len(uniq) else 0
+        if span <= MAX_ID_SPREAD * max(len(uniq), 1):
+            self._id_slots = np.full(span, -1, dtype=np.int32)
+            self._id_slots[uniq - self._id_lo] = np.arange(len(uniq), dtype=np.int32)
+            self._ids = None
+        else:
+            self._id_slots = None
+            self._ids = pd.Index(uniq)
+
+    # ── Sort keys ─────────────────────────────────────────────────────────────
+    def add_key(self, name, values):
+        """Make per-row ``values`` (aligned with the table) sortable as ``name``.
+
+        Re-adding the same array is free; new values drop the key's permutations.
+        """
+        values = np.asarray(values)
+        with self._lock:
+            if self._values.get(name) is values:
+                return
+            self._values[name] = values
+            self._orders = {k: v for k, v in self._orders.items() if k[0] != name}
+            self._sorted = {k: v for k, v in self._sorted.items() if k[0] != name}
+
+    def _key(self, name):
+        with self._lock:
+            if name not in self._values:
+                if name not in SORT_KEYS:
+                    raise KeyError(f"unknown sort key {name!r}")
+                self._values[name] = self.df[name].to_numpy()
+            return self._values[name]
+
+    def _sort_values(self, name, ascending, idx=None):
+        """Ascending sort key of ``name``, for rows ``idx`` only when given."""
+        values = self._key(name)
+        if idx is not None:
+            values = values[idx]
+        return values if ascending else -values.astype(np.float64)
+
+    def _table_order(self, name, ascending):
+        """All row positions sorted by ``name``, ties by row."""
+        with self._lock:
+            if (name, ascending) not in self._sorted:
+                self._sorted[name, ascending] = np.argsort(self._sort_values(name, ascending),
+                                                           kind="stable")
+            return self._sorted[name, ascending]
+
+    def _order(self, name, ascending):
+        """Row positions grouped by cell, each cell's run sorted by ``name``."""
+        with self._lock:
+            if (name, ascending) not in self._orders:
+                self._orders[name, ascending] = np.lexsort(
+                    (self._sort_values(name, ascending), self._cell))
+            return self._orders[name, ascending]
+
+    # ── Segments ──────────────────────────────────────────────────────────────
+    def select(self, geo, gender, age, year=None, segment=None):
+        """Cell ids of the sidebar filter narrowed by ``segment`` (column → value(s))."""
+        mask = filter_mask(self.cells, geo, gender, age)
+        if year is not None:
+            mask &= self.cells["Year"].to_numpy() == year
+        for col, values in (segment or {}).items():
+            values = values if isinstance(values, (list, tuple, set)) else [values]
+            mask &= self.cells[col].isin(values).to_numpy()
+        return np.flatnonzero(mask)
+
+    def count(self, cells):
+        return int(self.cells["Customers"].to_numpy()[cells].sum())
+
+    def rows(self, cells, by="Balance", ascending=False, start=0, stop=PAGE_SIZE):
+        """Row positions ``start:stop`` of the segment sorted by ``by`` (ties by row)."""
+        begin = self._offsets[cells]
+        counts = self._offsets[cells + 1] - begin
+        take = np.minimum(counts, stop)
+        total = counts.sum()
+        if total and stop * len(self.df) / total < take.sum():
+            return self._scan(cells, by, ascending, start, stop)
+        # Leading ``take`` entries of every selected cell's run, merged.
+        within = np.arange(take.sum()) - np.repeat(np.cumsum(take) - take, take)
+        cand = self._order(by, ascending)[np.repeat(begin, take) + within]
+        merged = np.lexsort((cand, self._sort_values(by, ascending, cand)))
+        return cand[merged[start:stop]]
+
+    def _scan(self, cells, by, ascending, start, stop):
+        """``rows()`` of a broad segment: walk the table-wide order, keeping its cells."""
+        order = self._table_order(by, ascending)
+        selected = np.zeros(len(self.cells), dtype=bool)
+        selected[cells] = True
+        found, pos, chunk = [], 0, max(stop, 1024)
+        while pos < len(order) and sum(map(len, found)) < stop:
+            rows = order[pos:pos + chunk]
+            found.append(rows[selected[self._cell[rows]]])
+            pos += chunk
+            chunk *= 2
+        return np.concatenate(found or [order[:0]])[start:stop]
+
+    def page(self, cells, page=0, by="Balance", ascending=False, size=PAGE_SIZE):
+        """``(customers, total)``: page ``page`` of the segment and its customer count."""
+        idx = self.rows(cells, by, ascending, page * size, (page + 1) * size)
+        return self.frame(idx, by), self.count(cells)
+
+    def frame(self, idx, by=None):
+        out = self.df.iloc[idx][COLUMNS].reset_index(drop=True)
+        if by is not None and by not in out.columns:
+            out.insert(1, by, self._values[by][idx])
+        return out
+
+    # ── CustomerId lookup ─────────────────────────────────────────────────────
+    def lookup(self, customer_id):
+        """Row positions of ``customer_id`` (one per Year it appears in), possibly empty."""
+        if self._id_slots is not None:
+            slot = int(customer_id) - self._id_lo
+            g = self._id_slots[slot] if 0 <= slot < len(self._id_slots) else -1
+        else:
+            g = self._ids.get_loc(customer_id) if customer_id in self._ids else -1
+        if g < 0:
+            return np.empty(0, dtype=np.intp)
+        start = self._id_starts[g]
+        return self._by_id[start:start + self._id_counts[g]]
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import churn_core
+    import churn_data
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=churn_data.DATA_PATH)
+    parser.add_argument("--geo", nargs="+", default=churn_core.GEOGRAPHIES)
+    parser.add_argument("--gender", nargs="+", default=churn_core.GENDERS)
+    parser.add_argument("--age", nargs="+", default=churn_core.AGE_GROUPS)
+    parser.add_argument("--year", type=int)
+    parser.add_argument("--segment", nargs="*", default=[], metavar="COLUMN=VALUE")
+    parser.add_argument("--by", default="Balance", choices=SORT_KEYS)
+    parser.add_argument("--ascending", action="store_true")
+    parser.add_argument("--page", type=int, default=0)
+    parser.add_argument("--size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--id", type=int, help="look up one CustomerId instead")
+    args = parser.parse_args()
+
+    df = churn_core.load_data(args.csv)
+    t0 = time.perf_counter()
+    index = SegmentIndex(df)
+    print(f"indexed {len(df):,} rows into {len(index.cells):,} cells in "
+          f"{time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    if args.id is not None:
+        out, what = index.frame(index.lookup(args.id)), f"CustomerId {args.id}"
+    else:
+        segment = {}
+        for item in args.segment:
+            col, _, value = item.partition("=")
+            segment.setdefault(col, []).append(int(value) if value.lstrip("-").isdigit() else value)
+        cells = index.select(args.geo, args.gender, args.age, args.year, segment)
+        index.page(cells, 0, args.by, args.ascending, args.size)  # builds the sort permutation
+        t0 = time.perf_counter()
+        out, total = index.page(cells, args.page, args.by, args.ascending, args.size)
+        what = f"page {args.page} of {total:,} customers in {len(cells):,} cells"
+    elapsed = time.perf_counter() - t0
+    print(out.to_string(index=False))
+    print(f"{what} in {elapsed * 1e3:.2f} ms")
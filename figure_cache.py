@@ -0,0 +1,83 @@
+"""Bounded LRU cache of rendered chart images.
+
+Matplotlib rasterisation dominates page latency once the aggregates come from
+the segment cube, so each chart is rendered to PNG bytes once per
+(page, chart id, filter selection, dimension choices) key and re-sent from the
+cache on later reruns with the same view.
+"""
+import io
+import threading
+from collections import OrderedDict
+
+import matplotlib.pyplot as plt
+
+# Same output settings st.pyplot uses, so cached images look identical.
+SAVEFIG_KWARGS = {"format": "png", "bbox_inches": "tight", "dpi": 200}
+
+
+def render_png(fig):
+    """Rasterise ``fig`` to PNG bytes and close it."""
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, **SAVEFIG_KWARGS)
+    finally:
+        plt.close(fig)
+    return buf.getvalue()
+
+
+class FigureCache:
+    """Thread-safe LRU of PNG bytes with hit/miss counters.
+
+    ``get(key, draw)`` returns the cached image for ``key`` or calls ``draw()``
+    — which must build and return a matplotlib figure — renders it and stores
+    the result, evicting the least recently used entry beyond ``maxsize``.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, draw):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+        png = render_png(draw())
+        with self._lock:
+            self._entries[key] = png
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return png
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        with self._lock:
+            return sum(len(png) for png in self._entries.values())
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "maxsize": self.maxsize,
+            "bytes": self.nbytes,
+        }
@@ -0,0 +1,100 @@
+"""Concurrent-client load test of the query service.
+
+``python load_test.py [--url URL] [--clients 50] [--requests 40] [--distinct 30]``
+opens ``--clients`` keep-alive connections that each send ``--requests``
+segment queries drawn from a pool of ``--distinct`` sidebar-style queries
+(filter subsets × dashboard group-bys), so clients repeatedly ask for the
+same views as real sessions do. It reports p50 / p90 / p99 / max latency and
+throughput, plus the service's cache hits, misses and coalesced queries during
+the run. Start the service first (``python query_service.py``).
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+from churn_core import AGE_GROUPS, GENDERS, GEOGRAPHIES
+from query_service import DEFAULT_PORT, query_url
+
+# Group-bys the dashboard pages issue.
+GROUP_BYS = [(), ("Geography",), ("AgeGroup",), ("Gender",), ("NumOfProducts",),
+             ("BalanceSeg",), ("CreditBand",), ("IsActiveMember",),
+             ("Geography", "AgeGroup"), ("Geography", "Gender")]
+
+
+def _subset(rng, values):
+    return sorted(rng.sample(values, rng.randint(1, len(values))))
+
+
+def query_pool(base_url, n, seed=0):
+    """``n`` distinct query paths; the unfiltered view is always among them."""
+    rng = random.Random(seed)
+    urls = {query_url(base_url)}
+    while len(urls) < n:
+        urls.add(query_url(base_url, _subset(rng, GEOGRAPHIES), _subset(rng, GENDERS),
+                           _subset(rng, AGE_GROUPS), by=rng.choice(GROUP_BYS)))
+    return [urllib.parse.urlsplit(u) for u in sorted(urls)]
+
+
+async def client(host, port, targets, n, rng, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n):
+            url = rng.choice(targets)
+            t0 = time.perf_counter()
+            writer.write(f"GET {url.path}?{url.query} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - t0)
+            if status != 200:
+                raise RuntimeError(f"HTTP {status} for {url.geturl()}")
+    finally:
+        writer.close()
+
+
+def _stats(base_url):
+    with urllib.request.urlopen(base_url.rstrip("/") + "/stats") as resp:
+        return json.load(resp)
+
+
+async def run(base_url, clients, requests, distinct, seed):
+    url = urllib.parse.urlsplit(base_url)
+    targets = query_pool(base_url, distinct, seed)
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(client(url.hostname, url.port, targets, requests,
+                                  random.Random(seed + i + 1), latencies)
+                           for i in range(clients)))
+    return np.array(latencies), time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=40, help="requests per client")
+    parser.add_argument("--distinct", type=int, default=30, help="distinct queries in the mix")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    before = _stats(args.url)
+    lat, wall = asyncio.run(run(args.url, args.clients, args.requests, args.distinct, args.seed))
+    after = _stats(args.url)
+    ms = lat * 1e3
+    p50, p90, p99 = np.percentile(ms, [50, 90, 99])
+    print(f"{len(lat):,} requests from {args.clients} clients ({args.distinct} distinct queries) "
+          f"in {wall:.2f}s → {len(lat)/wall:,.0f} req/s")
+    print(f"latency ms: p50 {p50:.2f} · p90 {p90:.2f} · p99 {p99:.2f} · max {ms.max():.2f}")
+    print("service: " + " · ".join(f"{k} +{after[k] - before[k]:,}"
+                                   for k in ("hits", "misses", "coalesced")))
@@ -0,0 +1,169 @@
+"""Process-pool execution of segment aggregation and scoring over row shards.
+
+The customer table is split into contiguous row shards; each shard is
+aggregated (segment cube + Balance sketches, via ``streaming.StreamAggregate``)
+or scored in a worker process and the partial results are merged. Cube counts
+and Balance cents are integers and the per-row scores do not depend on the
+shard, so the merged result is identical to the serial path for any worker
+count.
+
+A source is either a DataFrame, whose shards are pickled to the workers, or a
+columnar store directory (``columnar_store.py``), which each worker
+memory-maps itself so shards are read from the shared page cache instead of
+being copied.
+
+The worker count defaults to the ``CHURN_WORKERS`` environment variable, else
+the number of CPUs. ``python parallel.py [csv] --workers 1 2 4 8`` runs the
+scaling benchmark.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from streaming import StreamAggregate
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def default_workers():
+    return int(os.environ.get("CHURN_WORKERS", 0)) or os.cpu_count() or 1
+
+
+def _init_worker(threads):
+    # Split the cores between workers so the model's OpenMP threads do not
+    # oversubscribe them; must be set before scikit-learn is imported.
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+
+# spawn: safe to start from Streamlit's threaded server process. Each new
+# worker re-runs the parent's main script as ``__mp_main__``; every entry point
+# here keeps its work under an ``if __name__ == "__main__"`` guard.
+worker_context = multiprocessing.get_context("spawn")
+
+
+def _pool(workers):
+    with _pools_lock:
+        pool = _pools.get(workers)
+        if pool is None:
+            threads = max((os.cpu_count() or 1) // workers, 1)
+            pool = _pools[workers] = ProcessPoolExecutor(
+                workers, mp_context=worker_context, initializer=_init_worker,
+                initargs=(threads,))
+        return pool
+
+
+def shutdown():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown()
+        _pools.clear()
+
+
+def shard_bounds(n_rows, shards):
+    edges = np.linspace(0, n_rows, max(min(shards, n_rows), 1) + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _rows(source, start, stop):
+    if isinstance(source, str):
+        import columnar_store
+        source = columnar_store.load_store(source)
+    return source.iloc[start:stop]
+
+
+def _aggregate_shard(source, start, stop, alpha):
+    return StreamAggregate(alpha).add(_rows(source, start, stop))
+
+
+def _score_shard(source, start, stop, model, meta, batch_size):
+    import churn_model
+    return churn_model.score(model, meta, _rows(source, start, stop), batch_size)
+
+
+def _n_rows(source):
+    if isinstance(source, str):
+        import columnar_store
+        return columnar_store.read_meta(source)["rows"]
+    return len(source)
+
+
+def map_shards(fn, source, *args, workers=None, shards=None):
+    """Run ``fn(source_or_shard, start, stop, *args)`` over row shards, in order.
+
+    With one worker the shards are processed in this process, which is the
+    serial reference path.
+    """
+    workers = workers or default_workers()
+    bounds = shard_bounds(_n_rows(source), shards or workers)
+    if workers == 1:
+        return [fn(source, start, stop, *args) for start, stop in bounds]
+    pool = _pool(workers)
+    if isinstance(source, str):
+        futures = [pool.submit(fn, source, start, stop, *args) for start, stop in bounds]
+    else:
+        futures = [pool.submit(fn, source.iloc[start:stop], 0, stop - start, *args)
+                   for start, stop in bounds]
+    return [f.result() for f in futures]
+
+
+def aggregate(source, workers=None, shards=None, alpha=0.005):
+    """Segment cube + Balance sketches of ``source``, merged across shards."""
+    parts = map_shards(_aggregate_shard, source, alpha, workers=workers, shards=shards)
+    out = StreamAggregate(alpha)
+    for part in parts:
+        out.merge(part)
+    return out
+
+
+def score(source, model, meta, workers=None, shards=None, batch_size=200_000):
+    """Churn probability of every row of ``source``, scored shard-parallel."""
+    parts = map_shards(_score_shard, source, model, meta, batch_size,
+                       workers=workers, shards=shards)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.float32)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import churn_data
+    import churn_model
+    import columnar_store
+    from segment_cube import MEASURES, build_cube, CUBE_DIMS
+    # Go through the importable module so tasks pickle as parallel.*, not __main__.*.
+    from parallel import aggregate, score, shutdown
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=churn_data.DATA_PATH)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    store = columnar_store.default_store_dir(args.csv)
+    if not columnar_store.is_fresh(args.csv, store):
+        columnar_store.ingest(args.csv, store)
+    df = columnar_store.load_store(store)
+    model, meta = churn_model.get_model(churn_data.load_data(args.csv))
+
+    ref_cube = build_cube(df).set_index(CUBE_DIMS).sort_index()[MEASURES]
+    ref_proba = churn_model.score(model, meta, df)
+    print(f"{len(df):,} rows, {os.cpu_count()} CPUs")
+    for workers in args.workers:
+        if workers > 1:
+            # Warm the pool: worker start-up and imports are paid once per process.
+            aggregate(store, workers=workers)
+            score(store, model, meta, workers=workers)
+        t0 = time.perf_counter()
+        agg = aggregate(store, workers=workers)
+        t_agg = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        proba = score(store, model, meta, workers=workers)
+        t_score = time.perf_counter() - t0
+        cube = agg.cube.set_index(CUBE_DIMS).sort_index()[MEASURES]
+        same = cube.equals(ref_cube) and np.array_equal(proba, ref_proba)
+        print(f"{workers:>2} workers: aggregate {t_agg:6.2f}s ({len(df)/t_agg:>12,.0f} rows/s) · "
+              f"score {t_score:6.2f}s ({len(df)/t_score:>10,.0f} rows/s) · identical={same}")
+    shutdown()
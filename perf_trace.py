@@ -0,0 +1,133 @@
+"""Lightweight timing spans for dashboard reruns.
+
+A ``Tracer`` records nested ``(name, start, end, depth)`` spans. Disabled, it
+hands out one shared no-op context manager and ``wrap()`` returns objects
+unchanged, so instrumented code pays an attribute lookup and nothing else.
+Enabled, ``wrap(obj)`` returns a proxy that times every call of the object's
+functions as ``"<name>.<function>"`` — used for ``churn_core`` and
+``charts``, so their spans need no ``with`` blocks at call sites.
+
+``breakdown()`` and ``SpanStats`` turn the spans of a rerun into tables and
+``chrome_trace()`` into a Chrome / Perfetto trace-event file.
+"""
+import contextlib
+import functools
+import time
+
+import pandas as pd
+
+_NOOP = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "start", "depth")
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+
+    def __enter__(self):
+        self.depth = self.tracer._depth
+        self.tracer._depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        self.tracer._depth -= 1
+        self.tracer.spans.append((self.name, self.start, end, self.depth))
+        return False
+
+
+class _Traced:
+    """Proxy timing every call of ``target``'s callables."""
+
+    def __init__(self, tracer, target, name):
+        self._tracer = tracer
+        self._target = target
+        self._name = name
+
+    def __getattr__(self, attr):
+        value = getattr(self._target, attr)
+        if not callable(value) or isinstance(value, type):
+            return value
+        span_name = f"{self._name}.{attr}"
+
+        @functools.wraps(value)
+        def timed(*args, **kwargs):
+            with self._tracer.span(span_name):
+                return value(*args, **kwargs)
+        return timed
+
+
+class Tracer:
+    """Spans of one rerun; ``span(name)`` is a no-op unless ``enabled``."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self._depth = 0
+        self.start = time.perf_counter()
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NOOP
+
+    def wrap(self, target, name=None):
+        if not self.enabled:
+            return target
+        return _Traced(self, target, name or getattr(target, "__name__", type(target).__name__))
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+
+def breakdown(spans, total):
+    """One row per span in start order: duration, self time and share of ``total`` seconds."""
+    rows = sorted(spans, key=lambda s: (s[1], s[3]))
+    child = [0.0] * len(rows)
+    for i, (_, start, end, depth) in enumerate(rows):
+        # The enclosing span is the latest earlier one a level up.
+        for j in range(i - 1, -1, -1):
+            if rows[j][3] == depth - 1:
+                child[j] += end - start
+                break
+    return pd.DataFrame({
+        "Span":      ["  " * depth + name for name, _, _, depth in rows],
+        "ms":        [round((end - start) * 1e3, 2) for _, start, end, _ in rows],
+        "Self ms":   [round((end - start - c) * 1e3, 2) for (_, start, end, _), c in zip(rows, child)],
+        "% of rerun": [round((end - start) / total * 100, 1) if total else 0.0
+                       for _, start, end, _ in rows],
+    })
+
+
+class SpanStats:
+    """Count, total and worst duration per span name across reruns."""
+
+    def __init__(self):
+        self.reruns = 0
+        self.rerun_seconds = 0.0
+        self._stats = {}
+
+    def add(self, spans, total):
+        self.reruns += 1
+        self.rerun_seconds += total
+        for name, start, end, _ in spans:
+            count, sum_s, max_s = self._stats.get(name, (0, 0.0, 0.0))
+            self._stats[name] = (count + 1, sum_s + end - start, max(max_s, end - start))
+
+    def table(self):
+        out = pd.DataFrame([(name, c, s * 1e3, s / c * 1e3, m * 1e3)
+                            for name, (c, s, m) in self._stats.items()],
+                           columns=["Span", "Calls", "Total ms", "Mean ms", "Max ms"])
+        return out.sort_values("Total ms", ascending=False, ignore_index=True).round(2)
+
+
+def chrome_trace(reruns):
+    """Chrome trace-event JSON (``chrome://tracing``, Perfetto) of ``[(rerun, spans), ...]``."""
+    events = []
+    for rerun, spans in reruns:
+        for name, start, end, depth in spans:
+            events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                           "ts": round(start * 1e6, 1), "dur": round((end - start) * 1e6, 1),
+                           "args": {"rerun": rerun, "depth": depth}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,253 @@
+"""Local HTTP query service answering segment queries from one shared cube.
+
+Every Streamlit session otherwise loads, filters and rolls up the customer
+table on its own. This asyncio server loads the banded table and its segment
+cube once (``churn_core``) and answers
+
+    GET /query?geo=Germany&geo=Spain&age=46–60&year=2025&by=Gender&by=AgeGroup
+
+with Customers / Churned / ChurnRate (plus the additive BalanceCents / AgeSum
+sums) per group of the ``by`` dimensions. Omitted filters select everything;
+an empty one (``geo=``) selects nothing, like a cleared sidebar filter.
+Responses are kept in a shared LRU cache keyed by the normalised query, and
+identical queries that arrive while one is being computed wait for that single
+computation instead of starting their own. ``GET /stats`` reports the cache
+counters.
+
+``python query_service.py [csv] [--port 8765]`` starts the service; the
+dashboard uses it when ``CHURN_QUERY_URL`` is set (see ``fetch_cube``), and
+``load_test.py`` measures its latency under concurrent clients.
+"""
+import asyncio
+import json
+import time
+import traceback
+import urllib.parse
+import urllib.request
+from collections import OrderedDict
+
+import pandas as pd
+
+import churn_core as core
+import churn_data
+from segment_cube import CUBE_DIMS, MEASURES
+
+DEFAULT_PORT = 8765
+CACHE_SIZE = 1024
+_FILTERS = {"geo": "Geography", "gender": "Gender", "age": "AgeGroup"}
+
+
+class QueryError(ValueError):
+    """A malformed query; answered with HTTP 400."""
+
+
+class QueryService:
+    """Shared table, cube and result cache behind the HTTP handler."""
+
+    def __init__(self, path=churn_data.DATA_PATH, cache_size=CACHE_SIZE):
+        self.df = core.load_data(path)
+        self.cube = core.load_cube(self.df, path)
+        self.years = core.load_years(path)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self.hits = self.misses = self.coalesced = 0
+
+    def parse(self, params):
+        """Normalised, hashable query key from parsed query-string ``params``."""
+        unknown = set(params) - {"geo", "gender", "age", "year", "by"}
+        if unknown:
+            raise QueryError(f"unknown parameter(s): {', '.join(sorted(unknown))}")
+        filters = []
+        for name, dim in _FILTERS.items():
+            values = params.get(name)
+            filters.append(tuple(sorted(v for v in values if v)) if values is not None
+                           else tuple(self.cube[dim].cat.categories))
+        year = None
+        if "year" in params:
+            try:
+                year = int(params["year"][-1])
+            except ValueError:
+                raise QueryError("year must be an integer") from None
+            if year not in self.years.years:
+                raise QueryError(f"no data for year {year}")
+        by = tuple(params.get("by", ()))
+        bad = [d for d in by if d not in CUBE_DIMS]
+        if bad or len(set(by)) != len(by):
+            raise QueryError(f"by must be distinct dimensions of {', '.join(CUBE_DIMS)}")
+        return (*filters, year, by)
+
+    def _compute(self, key):
+        """JSON response body of ``key``; runs in a worker thread."""
+        geo, gender, age, year, by = key
+        fcube = core.filter_cube(self.cube, geo, gender, age, year, self.years)
+        if by:
+            out = fcube.groupby(list(by), observed=True, dropna=False)[MEASURES].sum().reset_index()
+        else:
+            out = fcube[MEASURES].sum().to_frame().T
+        out["ChurnRate"] = out["Churned"] / out["Customers"]
+        categories = {d: [str(c) for c in fcube[d].cat.categories]
+                      for d in by if isinstance(fcube[d].dtype, pd.CategoricalDtype)}
+        return json.dumps({"by": list(by), "columns": list(out.columns),
+                           "rows": out.astype(object).values.tolist(),
+                           "categories": categories}, ensure_ascii=False).encode("utf-8")
+
+    async def query(self, key):
+        """Response body for ``key``: cached, joined to an identical in-flight query, or computed."""
+        body = self._cache.get(key)
+        if body is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return body
+        task = self._inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(asyncio.to_thread(self._compute, key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced += 1
+        # shield: a client hanging up must not cancel the computation others await.
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        del self._inflight[key]
+        if not task.cancelled() and task.exception() is None:
+            self._cache[key] = task.result()
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def stats(self):
+        return {"rows": len(self.df), "cube_cells": len(self.cube), "hits": self.hits,
+                "misses": self.misses, "coalesced": self.coalesced,
+                "entries": len(self._cache), "maxsize": self.cache_size,
+                "inflight": len(self._inflight)}
+
+
+# ── HTTP ──────────────────────────────────────────────────────────────────────
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+def _response(status, body, keep_alive):
+    head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+def _error(message):
+    return json.dumps({"error": message}).encode("utf-8")
+
+
+async def _dispatch(service, method, url):
+    """``(status, body)`` of one request."""
+    if method != "GET":
+        return 405, _error("only GET is supported")
+    if url.path == "/query":
+        try:
+            key = service.parse(urllib.parse.parse_qs(url.query, keep_blank_values=True))
+        except QueryError as e:
+            return 400, _error(str(e))
+        return 200, await service.query(key)
+    if url.path == "/stats":
+        return 200, json.dumps(service.stats()).encode("utf-8")
+    if url.path == "/health":
+        return 200, b'{"ok": true}'
+    return 404, _error(f"no such endpoint: {url.path}")
+
+
+async def _handle(service, reader, writer):
+    """Serve one connection; HTTP/1.1 keep-alive, GET only."""
+    try:
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            headers = {}
+            while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            method, target, version = request_line.decode("latin-1").split(" ", 2)
+            keep_alive = (headers.get("connection", "").lower() != "close"
+                          and version.strip() == "HTTP/1.1")
+            url = urllib.parse.urlsplit(target)
+
+            try:
+                status, body = await _dispatch(service, method, url)
+            except Exception:
+                traceback.print_exc()
+                status, body = 500, _error("internal error; see the service log")
+
+            writer.write(_response(status, body, keep_alive))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(service, host="127.0.0.1", port=DEFAULT_PORT):
+    server = await asyncio.start_server(lambda r, w: _handle(service, r, w), host, port,
+                                        backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+# ── Client ────────────────────────────────────────────────────────────────────
+def query_url(base_url, geo=None, gender=None, age=None, year=None, by=()):
+    """``/query`` URL; ``None`` filters are left out (everything), empty ones sent blank (nothing)."""
+    params = {name: list(values) or [""] for name, values in
+              (("geo", geo), ("gender", gender), ("age", age)) if values is not None}
+    params["by"] = list(by)
+    if year is not None:
+        params["year"] = [year]
+    qs = urllib.parse.urlencode(params, doseq=True)
+    return f"{base_url.rstrip('/')}/query?{qs}"
+
+
+def fetch(base_url, geo=None, gender=None, age=None, year=None, by=(), timeout=30):
+    """Query the service; one row per ``by`` group, dimensions typed as in the local cube."""
+    with urllib.request.urlopen(query_url(base_url, geo, gender, age, year, by),
+                                timeout=timeout) as resp:
+        payload = json.load(resp)
+    out = pd.DataFrame(payload["rows"], columns=payload["columns"])
+    for dim in payload["by"]:
+        if dim in payload["categories"]:
+            # Bands come from pd.cut, so they are ordered like the local ones.
+            out[dim] = pd.Categorical(out[dim], categories=payload["categories"][dim],
+                                      ordered=dim in churn_data.BANDS)
+        else:
+            out[dim] = out[dim].astype(churn_data.DTYPES[dim])
+    for col in MEASURES:
+        out[col] = out[col].astype("int64")
+    return out
+
+
+def fetch_cube(base_url, geo, gender, age, year=None):
+    """The filtered segment cube, as ``churn_core.filter_cube`` returns it locally."""
+    return fetch(base_url, geo, gender, age, year, by=CUBE_DIMS)[CUBE_DIMS + MEASURES]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=churn_data.DATA_PATH)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    service = QueryService(args.csv, args.cache_size)
+    print(f"loaded {len(service.df):,} rows ({len(service.cube):,} cube cells) in "
+          f"{time.perf_counter() - t0:.2f}s; serving on http://{args.host}:{args.port}",
+          flush=True)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
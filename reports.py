@@ -0,0 +1,487 @@
+"""Headless batch reports of every dashboard page per sidebar filter combination.
+
+Each combination of the sidebar filters — one Country, Gender and Age Group
+each, or "All" of them — becomes one report with the KPI cards, tables and
+charts of the Overview, Geographic, Demographic, Financial, Segment Explorer
+and Risk Scores pages, written as self-contained HTML and/or a PDF.
+
+The parent process loads the table once, builds the segment cube (and scores
+the churn model, for the Risk page) and starts a process pool whose workers
+receive the cube and scores once at start-up and memory-map the same columnar
+store, so no worker re-parses the CSV or re-aggregates the table.
+
+A combination is skipped when its inputs are unchanged since the last run:
+the digest of its filtered rows (an order-independent sum of per-row hashes),
+the bands, pages, formats, the model and this code, kept in
+``<out>/manifest.json``. Each run prints its wall time.
+
+``python reports.py [--geo All Germany] [--gender All] [--age ...]
+[--pages overview risk] [--format html pdf] [--out reports] [--workers N] [--force]``
+"""
+import base64
+import hashlib
+import html
+import itertools
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+
+import pandas as pd
+
+import churn_core as core
+import churn_data
+import columnar_store
+
+OUT_DIR = "reports"
+ALL = "All"
+PAGES = ["overview", "geographic", "demographic", "financial", "explorer", "risk"]
+FORMATS = ["html", "pdf"]
+# Modules whose changes alter report content; part of every input digest.
+SOURCES = ["reports.py", "churn_core.py", "churn_data.py", "columnar_store.py", "streaming.py",
+           "charts.py", "figure_cache.py", "segment_cube.py", "segment_stats.py", "segment_scan.py",
+           "year_partitions.py", "churn_model.py"]
+PDF_ROWS = 28
+# Segment Explorer and Risk page settings the reports use (the app's defaults).
+EXPLORER = ("Geography", "AgeGroup")
+HOT_SPOTS = 25
+AT_RISK = 100
+
+# Per-worker state, set once by _init_worker().
+_state = {}
+
+
+# ── Combinations ──────────────────────────────────────────────────────────────
+def combinations(geo=None, gender=None, age=None, age_groups=core.AGE_GROUPS):
+    """``[(name, title, (geo, gender, age)), ...]`` of the filter choices.
+
+    Each axis defaults to ``All`` plus every single value; ``All`` selects every value.
+    """
+    axes = [("Country", core.GEOGRAPHIES, geo), ("Gender", core.GENDERS, gender),
+            ("Age Group", list(age_groups), age)]
+    for label, values, chosen in axes:
+        unknown = set(chosen or []) - set(values) - {ALL}
+        if unknown:
+            raise ValueError(f"unknown {label} {', '.join(sorted(unknown))}; "
+                             f"expected {ALL} or one of {', '.join(values)}")
+    out = []
+    for picks in itertools.product(*(chosen or [ALL] + values for _, values, chosen in axes)):
+        filters = tuple(values if pick == ALL else [pick] for (_, values, _), pick in zip(axes, picks))
+        name = "__".join(_slug(pick) for pick in picks)
+        title = " · ".join(f"{label}: {pick}" for (label, _, _), pick in zip(axes, picks))
+        out.append((name, title, filters))
+    return out
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(text)).strip("-") or "x"
+
+
+# ── Page content ──────────────────────────────────────────────────────────────
+# Each builder returns a section: title, KPI cards (value, label, colour class),
+# charts (id, draw) and tables (title, DataFrame), as the dashboard lays it out.
+def _bars(tbl, dim, title, figsize=(5,4), labels=None):
+    import charts
+    return charts.churn_bars(labels or tbl[dim].astype(str).tolist(), tbl["ChurnRate"].tolist(),
+                             charts.sig_colors(tbl), title, figsize)
+
+
+def _overview(v):
+    import charts
+    kpis = core.overview(v["fcube"])
+    geo, age, prod = (core.rate_table(v["fcube"], d) for d in ("Geography", "AgeGroup", "NumOfProducts"))
+    return {"title": "Churn Overview", "kpis": [
+                (f"{kpis['Customers']:,}", "Total Customers", ""),
+                (f"{kpis['Churned']:,}", "Churned Customers", "red-card"),
+                (f"{kpis['Retained']:,}", "Retained Customers", "green-card"),
+                (f"{kpis['Churn Rate (%)']:.1f}%", "Overall Churn Rate", "gold-card")],
+            "charts": [
+                ("retained_churned_pie", lambda: charts.donut(kpis["Retained"], kpis["Churned"])),
+                ("geo_churn_bar", lambda: _bars(geo, "Geography", "Churn Rate by Country")),
+                ("age_churn_bar", lambda: _bars(age, "AgeGroup", "Churn Rate by Age Group")),
+                ("products_churn_bar", lambda: _bars(
+                    prod, "NumOfProducts", "Churn Rate by Products Held",
+                    labels=[f"{i} Product(s)" for i in prod["NumOfProducts"]]))],
+            "tables": []}
+
+
+def _geographic(v):
+    import charts
+    from charts import ACCENT, GREEN, SIG_CARDS
+    geo = core.geo_stats(v["fcube"])
+    pivot = core.pivot(v["fcube"], "Geography", "AgeGroup")
+    return {"title": "Geographic Churn", "kpis": [
+                (f"{r.ChurnRate}%", f"{r.Geography} — {r.Customers:,} customers, {r.Churned:,} churned, "
+                 f"avg balance €{r.AvgBalance:,}, 95% CI {lo}–{hi}% {sig}", SIG_CARDS.get(sig, ""))
+                for r, lo, hi, sig in zip(geo.itertuples(), geo["CI Low (%)"], geo["CI High (%)"],
+                                          geo["vs Baseline"])],
+            "charts": [
+                ("geo_churn_bar", lambda: _bars(geo, "Geography", "Churn Rate by Country", (6,4))),
+                ("geo_churned_retained", lambda: charts.paired_bars(
+                    geo["Geography"], {"Retained": (geo["Customers"]-geo["Churned"], GREEN),
+                                       "Churned": (geo["Churned"], ACCENT)},
+                    "Churned vs Retained by Country")),
+                ("geo_age_heatmap", lambda: charts.heatmap(
+                    pivot, "Churn Rate (%) — Geography × Age Group"))],
+            "tables": [("Churn by Country", geo.rename(columns={"ChurnRate": "Churn Rate (%)"}))]}
+
+
+def _demographic(v):
+    import charts
+    from charts import ACCENT, LIGHT
+    fcube = v["fcube"]
+    age, gen, act = core.age_table(fcube), core.gender_table(fcube), core.activity_table(fcube)
+    gg = core.pivot(fcube, "Geography", "Gender")
+    out = [("age_churn_bar", lambda: _bars(age, "AgeGroup", "Churn Rate by Age Group", (6,4))),
+           ("gender_churn_bar", lambda: _bars(gen, "Gender", "Churn Rate by Gender", (6,4))),
+           ("active_churn_bar", lambda: _bars(act, "Label", "Churn Rate: Active vs Inactive"))]
+    if {"Female", "Male"} <= set(gg.columns):
+        out.append(("geo_gender_bar", lambda: charts.paired_bars(
+            gg.index, {"Female": (gg["Female"], ACCENT), "Male": (gg["Male"], LIGHT)},
+            "Churn Rate by Country & Gender", (5,4), 12, "Churn Rate (%)")))
+    return {"title": "Demographic Churn", "kpis": [], "charts": out, "tables": [
+                ("Churn by Age Group", age.rename(columns={"AgeGroup": "Age Group",
+                                                           "ChurnRate": "Churn Rate (%)"})),
+                ("Churn by Gender", gen.rename(columns={"ChurnRate": "Churn Rate (%)"}))]}
+
+
+def _financial(v):
+    import charts
+    from charts import ACCENT, LIGHT
+    fcube = v["fcube"]
+    prod, bal, cred = core.product_table(fcube), core.balance_table(fcube), core.credit_table(fcube)
+    hv = core.high_value(v["df"], v["mask"])
+    all_churn = core.overview(fcube)["Churn Rate (%)"]
+    return {"title": "Financial Segmentation", "kpis": [
+                (f"{hv['Churn Rate (%)']:.1f}%", "High-Value (Top 25%) Churn Rate", "red-card"),
+                (f"€{hv['Threshold']:,.0f}", "High-Value Balance Threshold", ""),
+                (f"€{hv['Assets Lost']:,.0f}", "Assets Lost with High-Value Churners", "gold-card")],
+            "charts": [
+                ("products_churn_bar", lambda: _bars(
+                    prod, "NumOfProducts", "Churn Rate by Products Held", (6,4),
+                    [f"{p} Products" for p in prod["NumOfProducts"]])),
+                ("balance_churn_bar", lambda: _bars(bal, "BalanceSeg", "Churn Rate by Balance Segment", (6,4))),
+                ("credit_churn_bar", lambda: _bars(cred, "CreditBand", "Churn Rate by Credit Score Band")),
+                ("high_value_bar", lambda: charts.churn_bars(
+                    ["All Customers", "High-Value (Top 25%)"],
+                    [round(all_churn, 1), round(hv["Churn Rate (%)"], 1)], [LIGHT, ACCENT],
+                    "High-Value vs Overall Churn Rate"))],
+            "tables": [
+                ("Churn by Products Held", prod.rename(columns={"NumOfProducts": "Products",
+                                                                "ChurnRate": "Churn Rate (%)"})),
+                ("Churn by Balance Segment", bal.rename(columns={"BalanceSeg": "Balance Segment",
+                                                                 "ChurnRate": "Churn Rate (%)"}))]}
+
+
+def _explorer(v):
+    import charts
+    fcube, (col1, col2) = v["fcube"], EXPLORER
+    dim1, dim2 = ({col: name for name, col in core.DIMENSIONS.items()}[c] for c in EXPLORER)
+    seg = core.rate_table(fcube, col1)
+    pivot = core.pivot(fcube, col1, col2)
+    kpis = core.overview(fcube)
+    top = seg.loc[seg["ChurnRate"].idxmax()]
+    tables = [(f"Churn by {dim1}", seg.rename(columns={col1: dim1, "ChurnRate": "Churn Rate (%)"}))]
+    years = v["years"]
+    yoy = core.yoy(years, col1, years.years[-1], *v["filters"])
+    if yoy is not None:
+        tables.append((f"Year-over-Year Change ({years.years[-1]})",
+                       yoy.reset_index().rename(columns={col1: dim1})))
+    tables.append((f"Top {HOT_SPOTS} Hot Spots", core.hot_spots(fcube).head(HOT_SPOTS)))
+    return {"title": "Segment Explorer", "kpis": [
+                (f"{kpis['Customers']:,}", "Customers in filtered view", ""),
+                (f"{kpis['Churn Rate (%)']:.1f}%", "Filtered Churn Rate", "gold-card"),
+                (f"{top[col1]} — {top['ChurnRate']:.1f}%", f"Highest churn {dim1}", "red-card")],
+            "charts": [
+                ("dim1_churn_bar", lambda: _bars(seg, col1, f"Churn Rate by {dim1}", (6,4.5))),
+                ("dim_heatmap", lambda: charts.heatmap(
+                    pivot, f"Churn Rate: {dim1} × {dim2}", (6,4.5), 10, 12, dim2, dim1, 30))],
+            "tables": tables}
+
+
+def _risk(v):
+    import churn_model
+    df, proba, meta = v["df"], v["proba"], v["model"]
+    mask = v["mask"] & (df["Exited"].to_numpy() == 0)
+    in_view = proba[mask]
+    return {"title": "Churn Risk Scores", "kpis": [
+                (f"{len(in_view):,}", "Customers Scored in View", ""),
+                (f"{in_view.mean()*100:.1f}%" if len(in_view) else "—", "Average Predicted Risk", "gold-card"),
+                (f"{(in_view >= 0.5).sum():,}", "High Risk (≥ 50%)", "red-card"),
+                (f"{meta['holdout_auc']:.3f}", "Model Hold-out AUC", "green-card")],
+            "charts": [],
+            "tables": [(f"Top {AT_RISK} At-Risk Customers",
+                        churn_model.top_at_risk(df, proba, mask, n=AT_RISK, include_churned=True))]}
+
+
+BUILDERS = {"overview": _overview, "geographic": _geographic, "demographic": _demographic,
+            "financial": _financial, "explorer": _explorer, "risk": _risk}
+
+
+# ── Rendering ─────────────────────────────────────────────────────────────────
+CSS = """
+body { font-family: sans-serif; background: #F8FAFB; color: #333; margin: 24px 40px; }
+h1 { color: #1F4E79; } h2 { color: #1F4E79; border-bottom: 2px solid #2E75B6; padding-bottom: 6px; }
+.cards { display: flex; gap: 12px; flex-wrap: wrap; }
+.metric-card { background: white; border-radius: 12px; padding: 16px 20px; flex: 1; min-width: 180px;
+               box-shadow: 0 2px 8px rgba(0,0,0,0.08); border-left: 5px solid #1F4E79; }
+.metric-card h3 { margin: 0; font-size: 1.6rem; color: #1F4E79; }
+.metric-card p { margin: 4px 0 0; color: #555; font-size: 0.9rem; }
+.red-card { border-left-color: #E74C3C; } .red-card h3 { color: #E74C3C; }
+.green-card { border-left-color: #27AE60; } .green-card h3 { color: #27AE60; }
+.gold-card { border-left-color: #F39C12; } .gold-card h3 { color: #F39C12; }
+.charts img { width: 48%; margin: 1%; }
+table { border-collapse: collapse; margin: 8px 0 20px; font-size: 0.85rem; }
+th, td { border: 1px solid #DDD; padding: 4px 8px; text-align: right; } th { background: #EBF3FB; }
+"""
+CARD_COLORS = {"": "#1F4E79", "red-card": "#E74C3C", "green-card": "#27AE60", "gold-card": "#F39C12"}
+
+
+def _html(title, subtitle, sections):
+    body = [f"<h1>🏦 {html.escape(title)}</h1><p>{html.escape(subtitle)}</p>"]
+    for sec, images in sections:
+        body.append(f"<h2>{html.escape(sec['title'])}</h2>")
+        if sec["kpis"]:
+            body.append("<div class='cards'>" + "".join(
+                f"<div class='metric-card {cls}'><h3>{html.escape(value)}</h3><p>{html.escape(label)}</p></div>"
+                for value, label, cls in sec["kpis"]) + "</div>")
+        if images:
+            body.append("<div class='charts'>" + "".join(
+                f"<img src='data:image/png;base64,{base64.b64encode(png).decode()}'>" for png in images)
+                + "</div>")
+        for name, table in sec["tables"]:
+            body.append(f"<h3>{html.escape(name)}</h3>" + table.to_html(index=False, border=0))
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+            f"<style>{CSS}</style></head><body>{''.join(body)}</body></html>")
+
+
+def _pdf_cover(plt, title, subtitle, sec):
+    """A4-landscape page with the section title and its KPI cards."""
+    fig = plt.figure(figsize=(11.69, 8.27))
+    fig.text(0.05, 0.92, f"{title} — {sec['title']}", fontsize=20, fontweight="bold", color="#1F4E79")
+    fig.text(0.05, 0.87, subtitle, fontsize=11, color="#555")
+    for i, (value, label, cls) in enumerate(sec["kpis"]):
+        x, y = 0.05 + (i % 3) * 0.31, 0.72 - (i // 3) * 0.16
+        fig.text(x, y, value, fontsize=22, fontweight="bold", color=CARD_COLORS[cls],
+                 bbox=dict(boxstyle="round,pad=0.6", facecolor="white", edgecolor=CARD_COLORS[cls]))
+        fig.text(x, y - 0.05, label, fontsize=10, color="#555")
+    return fig
+
+
+def _pdf_tables(plt, name, table):
+    """The table on as many A4-landscape pages as its rows need."""
+    shown = table.astype(str)
+    for start in range(0, max(len(shown), 1), PDF_ROWS):
+        part = shown.iloc[start:start + PDF_ROWS]
+        fig, ax = plt.subplots(figsize=(11.69, 8.27))
+        ax.axis("off")
+        more = f" (rows {start + 1}–{start + len(part)} of {len(shown)})" if len(shown) > PDF_ROWS else ""
+        ax.set_title(name + more, fontsize=14, fontweight="bold", color="#1F4E79", loc="left")
+        if len(part):
+            tbl = ax.table(cellText=part.values, colLabels=list(part.columns), loc="upper center",
+                           cellLoc="right")
+            tbl.auto_set_font_size(False)
+            tbl.set_fontsize(8)
+            tbl.auto_set_column_width(range(len(part.columns)))
+            tbl.scale(1, 1.3)
+        yield fig
+
+
+def write_report(sections, title, subtitle, base, formats):
+    """Render ``sections`` to ``base``.html / ``base``.pdf; returns the files written."""
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    from figure_cache import render_png
+
+    pdf = PdfPages(base + ".pdf.tmp") if "pdf" in formats else None
+    rendered = []
+    try:
+        for sec in sections:
+            if pdf:
+                cover = _pdf_cover(plt, title, subtitle, sec)
+                pdf.savefig(cover)
+                plt.close(cover)
+            images = []
+            for _, draw in sec["charts"]:
+                fig = draw()
+                if pdf:
+                    pdf.savefig(fig, bbox_inches="tight")
+                if "html" in formats:
+                    images.append(render_png(fig))
+                plt.close(fig)
+            if pdf:
+                for name, table in sec["tables"]:
+                    for fig in _pdf_tables(plt, name, table):
+                        pdf.savefig(fig)
+                        plt.close(fig)
+            rendered.append((sec, images))
+    finally:
+        if pdf:
+            pdf.close()
+    files = []
+    if pdf:
+        os.replace(base + ".pdf.tmp", base + ".pdf")
+        files.append(base + ".pdf")
+    if "html" in formats:
+        with open(base + ".html.tmp", "w", encoding="utf-8") as f:
+            f.write(_html(title, subtitle, rendered))
+        os.replace(base + ".html.tmp", base + ".html")
+        files.append(base + ".html")
+    return files
+
+
+# ── Workers ───────────────────────────────────────────────────────────────────
+def _init_worker(csv, bands, cube, scores, threads=None):
+    """Take the parent's cube and model scores; memory-map the table and its Year cubes."""
+    if threads:
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+    df = core.load_data(csv, bands)
+    proba, meta = scores or (None, None)
+    _state.update(df=df, cube=cube, proba=proba, model=meta, years=core.load_years(csv, df))
+
+
+def build(name, title, filters, pages, formats, out_dir):
+    """Write the report of one filter combination; returns ``(name, files, seconds)``."""
+    t0 = time.perf_counter()
+    df = _state["df"]
+    view = dict(_state, filters=filters, fcube=core.filter_cube(_state["cube"], *filters),
+                mask=core.row_mask(df, *filters))
+    if core.overview(view["fcube"])["Customers"] == 0:
+        sections = [{"title": "No customers match these filters", "kpis": [], "charts": [], "tables": []}]
+    else:
+        sections = [BUILDERS[page](view) for page in pages]
+    files = write_report(sections, "Customer Churn Report", title, os.path.join(out_dir, name), formats)
+    return name, files, time.perf_counter() - t0
+
+
+# ── Runs ──────────────────────────────────────────────────────────────────────
+def _code_version():
+    h = hashlib.sha256()
+    for path in SOURCES:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), path), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def _digest(row_hashes, shared):
+    """Digest of one combination: its rows' hash sum and count plus the shared inputs."""
+    return hashlib.sha256(json.dumps(
+        [int(row_hashes.sum()), len(row_hashes), shared], sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _load_manifest(out_dir):
+    try:
+        with open(os.path.join(out_dir, "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"reports": {}}
+
+
+def _write_index(out_dir, manifest):
+    rows = "".join(
+        f"<tr><td>{html.escape(entry['title'])}</td>"
+        + "".join(f"<td><a href='{html.escape(os.path.basename(p))}'>{p.rsplit('.', 1)[1].upper()}</a></td>"
+                  for p in entry["files"]) + "</tr>"
+        for _, entry in sorted(manifest["reports"].items()))
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Churn reports</title>"
+                f"<style>{CSS}</style></head><body><h1>🏦 Customer Churn Reports</h1>"
+                f"<table>{rows}</table></body></html>")
+
+
+def run(combos, pages=PAGES, formats=FORMATS, out_dir=OUT_DIR, csv=churn_data.DATA_PATH,
+        bands=None, workers=None, force=False):
+    """Build the reports of ``combos`` whose inputs changed; returns a run summary dict."""
+    import parallel
+
+    t0 = time.perf_counter()
+    bands = bands or churn_data.BANDS
+    os.makedirs(out_dir, exist_ok=True)
+    if not columnar_store.is_fresh(csv, columnar_store.default_store_dir(csv)):
+        columnar_store.ingest(csv)
+    core.load_years(csv)  # refresh the Year partitions before workers read them
+    df = core.load_data(csv, bands)
+    cube = core.load_cube(df, csv)
+    scores = core.load_scores(df, csv) if "risk" in pages else None
+
+    row_hashes = pd.util.hash_pandas_object(df[list(churn_data.DTYPES)], index=False).to_numpy()
+    shared = {"bands": {k: [v[0], list(v[1]), list(v[2])] for k, v in bands.items()},
+              "pages": list(pages), "formats": sorted(formats),
+              "model": scores and scores[1]["data_hash"],
+              "code": _code_version()}
+    manifest = _load_manifest(out_dir)
+    todo, skipped = [], []
+    for name, title, filters in combos:
+        digest = _digest(row_hashes[core.row_mask(df, *filters)], shared)
+        entry = manifest["reports"].get(name)
+        if (not force and entry and entry["digest"] == digest
+                and all(os.path.exists(p) for p in entry["files"])):
+            skipped.append(name)
+        else:
+            todo.append((name, title, filters, digest))
+    prepared = time.perf_counter() - t0
+
+    workers = min(workers or parallel.default_workers(), max(len(todo), 1))
+    titles = {name: title for name, title, _, _ in todo}
+    digests = {name: digest for name, _, _, digest in todo}
+    results = []
+    if todo and workers == 1:
+        _init_worker(csv, bands, cube, scores)
+        results = [build(*task[:3], pages, formats, out_dir) for task in todo]
+    elif todo:
+        threads = max((os.cpu_count() or 1) // workers, 1)
+        with ProcessPoolExecutor(workers, mp_context=parallel.worker_context,
+                                 initializer=_init_worker,
+                                 initargs=(csv, bands, cube, scores, threads)) as pool:
+            futures = [pool.submit(build, *task[:3], pages, formats, out_dir) for task in todo]
+            results = [f.result() for f in futures]
+
+    for name, files, seconds in results:
+        manifest["reports"][name] = {"digest": digests[name], "files": files,
+                                     "title": titles[name], "seconds": round(seconds, 2)}
+    wall = time.perf_counter() - t0
+    manifest["last_run"] = {"built": len(results), "skipped": len(skipped), "workers": workers,
+                            "wall_seconds": round(wall, 2),
+                            "at": time.strftime("%Y-%m-%dT%H:%M:%S%z")}
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+    _write_index(out_dir, manifest)
+    return {"built": results, "skipped": skipped, "workers": workers,
+            "prepare_seconds": prepared, "wall_seconds": wall}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    # Go through the importable module so pool tasks pickle as reports.*, not __main__.*.
+    from reports import combinations, run
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--csv", default=churn_data.DATA_PATH)
+    parser.add_argument("--bands", default=churn_data.BANDS_PATH, help="band edges JSON file")
+    parser.add_argument("--geo", nargs="+", help=f"countries or {ALL} (default: {ALL} and each)")
+    parser.add_argument("--gender", nargs="+", help=f"genders or {ALL} (default: {ALL} and each)")
+    parser.add_argument("--age", nargs="+", help=f"age groups or {ALL} (default: {ALL} and each)")
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=PAGES)
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--workers", type=int, help="default: CHURN_WORKERS or one per CPU")
+    parser.add_argument("--force", action="store_true", help="rebuild unchanged reports too")
+    args = parser.parse_args()
+
+    bands = churn_data.load_bands(args.bands)
+    try:
+        combos = combinations(args.geo, args.gender, args.age, bands["AgeGroup"][2])
+    except ValueError as e:
+        parser.error(str(e))
+    summary = run(combos, args.pages, args.format, args.out, args.csv, bands, args.workers, args.force)
+    for name, files, seconds in summary["built"]:
+        print(f"{seconds:6.2f}s  {name}")
+    print(f"{len(summary['built'])} built, {len(summary['skipped'])} unchanged of {len(combos)} "
+          f"combinations · {summary['workers']} worker(s) · prepared in "
+          f"{summary['prepare_seconds']:.2f}s · wall time {summary['wall_seconds']:.2f}s → {args.out}/")
@@ -0,0 +1,70 @@
+"""Precomputed count/sum cube over the dashboard's categorical dimensions.
+
+Every page of the dashboard aggregates ``Exited`` (plus an average balance and
+age) by one or two banded dimensions of the filtered customer table. Grouping
+the full table by *all* of those dimensions once yields a cube of at most a few
+thousand cells; the sidebar filter and every per-page groupby are then answered
+by slicing and summing the cube instead of scanning the raw rows.
+"""
+import numpy as np
+
+from churn_data import filter_mask
+
+# Dimensions the sidebar filters on or any page groups by.
+CUBE_DIMS = [
+    "Geography", "Gender", "AgeGroup", "CreditBand",
+    "TenureGroup", "BalanceSeg", "NumOfProducts", "IsActiveMember",
+]
+
+# Additive measures stored per cell; means are derived from them on roll-up.
+# Balance is summed in integer cents so cell sums are exact and independent of
+# the order rows (or shards of rows) are folded in.
+MEASURES = ["Customers", "Churned", "BalanceCents", "AgeSum"]
+
+
+def build_cube(df, dims=CUBE_DIMS):
+    """Aggregate the banded customer table into one row per observed cell of ``dims``."""
+    # The compact frame stores Exited/Age as int8; widen before summing so
+    # large cells cannot overflow.
+    measures = df[dims].assign(
+        Exited=df["Exited"].astype("int64"),
+        Balance=np.rint(df["Balance"].to_numpy() * 100).astype(np.int64),
+        Age=df["Age"].astype("int64"),
+    )
+    cube = measures.groupby(dims, observed=True, dropna=False).agg(
+        Customers=("Exited", "count"),
+        Churned=("Exited", "sum"),
+        BalanceCents=("Balance", "sum"),
+        AgeSum=("Age", "sum"),
+    )
+    return cube.reset_index()
+
+
+def slice_cube(cube, geo, gender, age):
+    """Cube equivalent of the sidebar's Country / Gender / Age Group filter."""
+    return cube[filter_mask(cube, geo, gender, age)]
+
+
+def totals(cube):
+    """Return ``(customers, churned)`` for a (sliced) cube."""
+    return int(cube["Customers"].sum()), int(cube["Churned"].sum())
+
+
+def rollup(cube, by):
+    """Sum the cube over every dimension not in ``by``.
+
+    Returns one row per observed group of ``by`` (indexed like the equivalent
+    ``df.groupby(by, observed=True)``) with Customers, Churned, ChurnRate
+    (0–1), AvgBalance and AvgAge.
+    """
+    g = cube.groupby(by, observed=True)[MEASURES].sum()
+    out = g[["Customers", "Churned"]].copy()
+    out["ChurnRate"]  = g["Churned"] / g["Customers"]
+    out["AvgBalance"] = g["BalanceCents"] / 100 / g["Customers"]
+    out["AvgAge"]     = g["AgeSum"] / g["Customers"]
+    return out
+
+
+def churn_pivot(cube, rows, cols):
+    """Churn rate (%) of ``rows`` × ``cols``, as ``groupby(...).unstack()`` gives it."""
+    return (rollup(cube, [rows, cols])["ChurnRate"] * 100).unstack(cols)
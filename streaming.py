@@ -0,0 +1,237 @@
+"""Chunked, constant-memory aggregation of customer extracts larger than RAM.
+
+``aggregate_csv()`` reads the CSV in bounded chunks, applies the same banding
+as ``churn_data.load_data()`` and folds each chunk into
+
+* a segment cube (``segment_cube.build_cube`` layout, so ``slice_cube`` /
+  ``rollup`` / ``churn_pivot`` work on it unchanged), and
+* a ``BalanceSketch`` per Country × Gender × Age Group filter cell, standing in
+  for the ``Balance.quantile(0.75)`` high-value threshold and the high-value
+  churn figures on the Financial Segmentation page.
+
+Peak memory is one chunk plus the accumulators, whose size depends on the
+number of segments and sketch buckets, not on the file length.
+
+Tolerance against the in-memory path: the cube is identical (Balance is
+summed in integer cents). The high-value threshold is within ``alpha`` (0.5% by default)
+relative of the exact quantile and the high-value customer count is exact;
+high-value churned / assets lost pro-rate the one sketch bucket straddling the
+threshold, so they are off by at most that bucket's share (well under 1% on
+the shipped extract).
+"""
+import numpy as np
+import pandas as pd
+
+import churn_data
+from segment_cube import CUBE_DIMS, MEASURES, build_cube
+
+FILTER_DIMS = ["Geography", "Gender", "AgeGroup"]
+CHUNKSIZE = 250_000
+
+
+class BalanceSketch:
+    """Mergeable log-bucket quantile sketch of Balance (DDSketch-style).
+
+    Positive balances fall in bucket ``ceil(log_gamma(x))`` with
+    ``gamma = (1+alpha)/(1-alpha)``, so a bucket's representative value is
+    within ``alpha`` relative of every value in it; non-positive balances go
+    to a dedicated zero bucket. Alongside the counts, the sketch tracks churned
+    counts and churned Balance sums (in cents, so merges are exact in any
+    order) per bucket so high-value churn can be read off the same buckets.
+    """
+
+    def __init__(self, alpha=0.005, min_value=1e-2, max_value=1e12):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = np.log(self.gamma)
+        self._offset = int(np.ceil(np.log(min_value) / self._log_gamma)) - 1
+        n = int(np.ceil(np.log(max_value) / self._log_gamma)) - self._offset + 1
+        # Bucket 0 holds non-positive balances.
+        self.counts        = np.zeros(n, dtype=np.int64)
+        self.churned       = np.zeros(n, dtype=np.int64)
+        self.churned_value = np.zeros(n, dtype=np.float64)
+
+    def _keys(self, values):
+        keys = np.zeros(len(values), dtype=np.int64)
+        pos = values > 0
+        keys[pos] = np.ceil(np.log(values[pos]) / self._log_gamma) - self._offset
+        return np.clip(keys, 0, len(self.counts) - 1)
+
+    def _value(self, key):
+        if key == 0:
+            return 0.0
+        return 2 * self.gamma ** (key + self._offset) / (self.gamma + 1)
+
+    def update(self, balance, exited):
+        balance = np.asarray(balance, dtype=np.float64)
+        exited  = np.asarray(exited).astype(bool)
+        keys = self._keys(balance)
+        n = len(self.counts)
+        self.counts        += np.bincount(keys, minlength=n)
+        self.churned       += np.bincount(keys[exited], minlength=n)
+        cents = np.rint(balance[exited] * 100)
+        self.churned_value += np.bincount(keys[exited], weights=cents, minlength=n)
+
+    def merge(self, other):
+        self.counts        += other.counts
+        self.churned       += other.churned
+        self.churned_value += other.churned_value
+        return self
+
+    def copy(self):
+        out = BalanceSketch.__new__(BalanceSketch)
+        out.__dict__.update(self.__dict__)
+        out.counts, out.churned = self.counts.copy(), self.churned.copy()
+        out.churned_value = self.churned_value.copy()
+        return out
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    def quantile_key(self, q):
+        """Bucket holding the order statistic pandas' ``quantile(q)`` starts from."""
+        rank = int(np.floor(q * (self.total - 1)))
+        return int(np.searchsorted(np.cumsum(self.counts), rank, side="right"))
+
+    def quantile(self, q):
+        if self.total == 0:
+            return float("nan")
+        return self._value(self.quantile_key(q))
+
+    def high_value(self, q=0.75):
+        """``(threshold, customers, churned, churned_balance)`` for Balance >= quantile(q).
+
+        The customer count is exact (ranks ``ceil(q*(n-1))`` and above); only
+        churned counts and balances of the bucket holding the threshold are
+        pro-rated.
+        """
+        if self.total == 0:
+            return float("nan"), 0, 0, 0.0
+        start = int(np.ceil(q * (self.total - 1)))
+        cum = np.cumsum(self.counts)
+        key = int(np.searchsorted(cum, start, side="right"))
+        frac = (cum[key] - start) / self.counts[key]
+        customers = int(cum[-1] - start)
+        churned = self.churned[key+1:].sum() + frac * self.churned[key]
+        value   = self.churned_value[key+1:].sum() + frac * self.churned_value[key]
+        return self.quantile(q), customers, int(round(churned)), float(value) / 100
+
+
+class StreamAggregate:
+    """Running segment cube plus per-filter-cell Balance sketches."""
+
+    def __init__(self, alpha=0.005):
+        self.alpha = alpha
+        self._cube = None
+        self.sketches = {}
+        self.rows = 0
+
+    def add(self, chunk):
+        """Fold one banded chunk (``churn_data.load_data`` layout) into the totals."""
+        part = build_cube(chunk)
+        # Chunks infer their own Geography/Gender categories, so fold on plain
+        # values and restore categoricals in ``cube``.
+        for dim in ("Geography", "Gender"):
+            part[dim] = part[dim].astype(object)
+        if self._cube is not None:
+            part = pd.concat([self._cube, part], ignore_index=True)
+            part = part.groupby(CUBE_DIMS, observed=True, dropna=False)[MEASURES].sum().reset_index()
+        self._cube = part
+
+        balance = chunk["Balance"].to_numpy()
+        exited  = chunk["Exited"].to_numpy()
+        groups = chunk.groupby(FILTER_DIMS, observed=True, dropna=False).indices
+        for cell, idx in groups.items():
+            cell = tuple(None if pd.isna(v) else v for v in cell)
+            sketch = self.sketches.get(cell)
+            if sketch is None:
+                sketch = self.sketches[cell] = BalanceSketch(self.alpha)
+            sketch.update(balance[idx], exited[idx])
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        """Combine with an aggregate built over a disjoint set of rows."""
+        if other._cube is not None:
+            if self._cube is None:
+                self._cube = other._cube.copy()
+            else:
+                both = pd.concat([self._cube, other._cube], ignore_index=True)
+                self._cube = both.groupby(CUBE_DIMS, observed=True, dropna=False)[MEASURES].sum().reset_index()
+        for cell, sketch in other.sketches.items():
+            if cell in self.sketches:
+                self.sketches[cell].merge(sketch)
+            else:
+                self.sketches[cell] = sketch.copy()
+        self.rows += other.rows
+        return self
+
+    @property
+    def cube(self):
+        if self._cube is None:
+            return None
+        cube = self._cube.copy()
+        for dim in ("Geography", "Gender"):
+            cube[dim] = cube[dim].astype("category")
+        return cube
+
+    def sketch(self, geo, gender, age):
+        """Merged Balance sketch for a sidebar filter selection."""
+        out = BalanceSketch(self.alpha)
+        for (g, s, a), sketch in self.sketches.items():
+            if g in geo and s in gender and a in age:
+                out.merge(sketch)
+        return out
+
+
+def iter_chunks(path, chunksize=CHUNKSIZE):
+    """Yield banded chunks of ``path`` with the compact ``churn_data`` dtypes."""
+    reader = pd.read_csv(path, usecols=list(churn_data.DTYPES),
+                         dtype=churn_data.DTYPES, chunksize=chunksize)
+    for chunk in reader:
+        yield churn_data.add_bands(chunk)
+
+
+def aggregate_csv(path=churn_data.DATA_PATH, chunksize=CHUNKSIZE, alpha=0.005):
+    agg = StreamAggregate(alpha)
+    for chunk in iter_chunks(path, chunksize):
+        agg.add(chunk)
+    return agg
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from segment_cube import rollup, slice_cube, totals
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=churn_data.DATA_PATH)
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    parser.add_argument("--check", action="store_true",
+                        help="also load the file in memory and report the differences")
+    args = parser.parse_args()
+
+    agg = aggregate_csv(args.csv, args.chunksize)
+    geo, gender = ["France", "Germany", "Spain"], ["Male", "Female"]
+    age = list(churn_data.BANDS["AgeGroup"][2])
+    customers, churned = totals(slice_cube(agg.cube, geo, gender, age))
+    threshold, hv_n, hv_churned, hv_lost = agg.sketch(geo, gender, age).high_value()
+    print(f"{agg.rows:,} rows · {customers:,} customers · {churned:,} churned")
+    print(f"high-value threshold €{threshold:,.2f}: {hv_n:,} customers, "
+          f"{hv_churned / max(hv_n, 1) * 100:.2f}% churn, €{hv_lost:,.0f} lost")
+    print(rollup(agg.cube, "Geography")[["Customers", "Churned", "ChurnRate"]])
+
+    if args.check:
+        df = churn_data.load_data(args.csv)
+        exact = df["Balance"].quantile(0.75)
+        hv = df[df["Balance"] >= exact]
+        print(f"in-memory threshold €{exact:,.2f} ({(threshold / exact - 1) * 100:+.3f}%), "
+              f"{len(hv):,} customers, {hv['Exited'].mean() * 100:.2f}% churn, "
+              f"€{hv.loc[hv['Exited'] == 1, 'Balance'].sum():,.0f} lost")
+        full = build_cube(df)
+        keys = CUBE_DIMS
+        a = full.set_index(keys).sort_index()
+        b = agg.cube.set_index(keys).sort_index()
+        assert (a[MEASURES].values == b[MEASURES].values).all()
+        print("cube identical to the in-memory build")
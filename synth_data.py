@@ -0,0 +1,87 @@
+"""Synthetic European_Bank-schema customer tables for benchmarking.
+
+Rows are bootstrapped from the shipped 10k-row extract, so the joint
+distribution of Geography, Gender, products, activity and churn is kept, and
+the continuous columns are jittered so large tables are not just copies:
+CreditScore ±15 points, Age ±2 years, non-zero Balance and EstimatedSalary
+scaled by ~5% log-normal noise, all clipped to the source ranges. CustomerIds
+are unique. Rows are generated and appended in chunks, so memory stays flat
+at any size.
+
+``python synth_data.py 1m [-o out.csv] [--seed 0] [--years 1]`` writes one
+table; sizes are 10k, 1m, 10m and 50m (or a plain row count).
+"""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+import churn_data
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000, "50m": 50_000_000}
+CHUNK_ROWS = 1_000_000
+OUT_DIR = "bench_data"
+
+
+def n_rows(size):
+    return SIZES[size.lower()] if size.lower() in SIZES else int(size)
+
+
+def default_path(size):
+    return os.path.join(OUT_DIR, f"European_Bank-{size.lower()}.csv")
+
+
+def _chunk(seed_df, rows, first_id, rng, years):
+    out = seed_df.iloc[rng.integers(0, len(seed_df), rows)].reset_index(drop=True)
+    out["CustomerId"] = np.arange(first_id, first_id + rows)
+    if years > 1:
+        last = int(seed_df["Year"].max())
+        out["Year"] = rng.integers(last - years + 1, last + 1, rows)
+    out["CreditScore"] = np.clip(out["CreditScore"] + rng.integers(-15, 16, rows), 350, 850)
+    out["Age"] = np.clip(out["Age"] + rng.integers(-2, 3, rows), 18, 92)
+    for col, hi in (("Balance", 299_999.99), ("EstimatedSalary", 199_999.99)):
+        noisy = out[col].to_numpy() * rng.lognormal(0.0, 0.05, rows)
+        out[col] = np.clip(noisy, 0.0, hi).round(2)
+    return out
+
+
+def generate(size, path=None, seed=0, years=1, source=churn_data.DATA_PATH):
+    """Write a synthetic table of ``size`` rows to ``path``; returns the path."""
+    rows = n_rows(size)
+    path = path or default_path(size)
+    seed_df = pd.read_csv(source)
+    rng = np.random.default_rng(seed)
+    first_id = int(seed_df["CustomerId"].min())
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    for start in range(0, rows, CHUNK_ROWS):
+        chunk = _chunk(seed_df, min(CHUNK_ROWS, rows - start), first_id + start, rng, years)
+        chunk.to_csv(tmp, mode="w" if start == 0 else "a", header=start == 0, index=False)
+    os.replace(tmp, path)
+    return path
+
+
+def ensure(size, seed=0):
+    """Path of the default synthetic table of ``size``, generated if missing."""
+    path = default_path(size)
+    if not os.path.exists(path):
+        generate(size, path, seed)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("size", help=f"{', '.join(SIZES)} or a row count")
+    parser.add_argument("-o", "--out")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--years", type=int, default=1, help="spread rows over this many years")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    path = generate(args.size, args.out, args.seed, args.years)
+    elapsed = time.perf_counter() - t0
+    print(f"wrote {n_rows(args.size):,} rows to {path} "
+          f"({os.path.getsize(path) / 1e6:,.0f} MB) in {elapsed:.1f}s")
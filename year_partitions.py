@@ -0,0 +1,191 @@
+"""Incremental, Year-partitioned segment aggregates.
+
+Extracts grow by appending a year (or a month) of customers at a time. Each
+``Year`` partition is aggregated once into a ``streaming.StreamAggregate``
+(segment cube + Balance sketches) and persisted under ``<csv>.years/``. A
+refresh only parses the bytes appended to the CSV since the previous refresh
+and folds those rows into their Year partition — new or existing — leaving
+the other partitions untouched. If the CSV was rewritten rather than appended
+to, the store is rebuilt from scratch.
+
+``python year_partitions.py [csv] [--rebuild]`` refreshes the store and prints
+the per-year totals.
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+
+import pandas as pd
+
+import churn_data
+from segment_cube import CUBE_DIMS, build_cube, rollup, slice_cube
+from streaming import CHUNKSIZE, StreamAggregate
+
+FORMAT_VERSION = 2
+_TAIL_BYTES = 4096
+
+
+def default_store_dir(csv_path=churn_data.DATA_PATH):
+    return os.path.splitext(csv_path)[0] + ".years"
+
+
+def _tail_hash(f, offset):
+    """Hash of the bytes just before ``offset``, used to detect rewrites."""
+    start = max(offset - _TAIL_BYTES, 0)
+    f.seek(start)
+    return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+class YearStore:
+    """Persisted per-Year aggregates of one CSV."""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self._aggs = {}
+        self._cubes = {}
+        try:
+            with open(os.path.join(store_dir, "manifest.json"), encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        except (OSError, ValueError):
+            self.manifest = None
+        if not self.manifest or self.manifest.get("version") != FORMAT_VERSION:
+            self.manifest = {"version": FORMAT_VERSION, "source": None, "years": {}}
+
+    @property
+    def years(self):
+        return sorted(int(y) for y in self.manifest["years"])
+
+    def _path(self, year):
+        return os.path.join(self.store_dir, f"year={year}.pkl")
+
+    def aggregate(self, year):
+        if year not in self._aggs:
+            with open(self._path(year), "rb") as f:
+                self._aggs[year] = pickle.load(f)
+        return self._aggs[year]
+
+    def cube(self, year):
+        """Segment cube of one Year partition (memoised)."""
+        if year not in self._cubes:
+            self._cubes[year] = self.aggregate(year).cube
+        return self._cubes[year]
+
+    def _save(self, touched, source):
+        os.makedirs(self.store_dir, exist_ok=True)
+        for year in touched:
+            tmp = self._path(year) + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(self._aggs[year], f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(year))
+            self._cubes.pop(year, None)
+            self.manifest["years"][str(year)] = {"rows": self._aggs[year].rows}
+        self.manifest["source"] = source
+        tmp = os.path.join(self.store_dir, "manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, os.path.join(self.store_dir, "manifest.json"))
+
+
+class FrameYears:
+    """In-memory stand-in for ``YearStore`` over the rows of a table.
+
+    Used for tables re-banded with custom edges or carrying extra cube
+    ``dims`` (behavioural clusters), which the persisted partitions (built
+    with the default bands) cannot answer.
+    """
+
+    def __init__(self, df, dims=CUBE_DIMS):
+        self.df = df
+        self.dims = dims
+        self.years = sorted(int(y) for y in pd.unique(df["Year"]))
+        self._cubes = {}
+
+    def cube(self, year):
+        if year not in self._cubes:
+            self._cubes[year] = build_cube(self.df[self.df["Year"].to_numpy() == year], self.dims)
+        return self._cubes[year]
+
+
+def refresh(csv_path=churn_data.DATA_PATH, store_dir=None, chunksize=CHUNKSIZE, rebuild=False):
+    """Bring the Year store of ``csv_path`` up to date and return it."""
+    store_dir = store_dir or default_store_dir(csv_path)
+    store = YearStore(store_dir)
+    size = os.path.getsize(csv_path)
+
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        source = store.manifest["source"]
+        start = None
+        if not rebuild and source and source["header"] == header.decode("utf-8"):
+            offset = source["offset"]
+            if offset <= size:
+                f.seek(offset - 1)
+                if f.read(1) == b"\n" and _tail_hash(f, offset) == source["tail_hash"]:
+                    start = offset
+        if start is None:
+            # First run, rewritten file or forced rebuild.
+            shutil.rmtree(store_dir, ignore_errors=True)
+            store = YearStore(store_dir)
+            start = len(header)
+        new_source = {"header": header.decode("utf-8"), "offset": size,
+                      "tail_hash": _tail_hash(f, size)}
+
+        touched = set()
+        if start < size:
+            f.seek(start)
+            names = header.decode("utf-8").strip().split(",")
+            reader = pd.read_csv(f, header=None, names=names, usecols=list(churn_data.DTYPES),
+                                 dtype=churn_data.DTYPES, chunksize=chunksize)
+            for chunk in reader:
+                chunk = churn_data.add_bands(chunk)
+                for year, part in chunk.groupby("Year"):
+                    year = int(year)
+                    if year not in store._aggs:
+                        store._aggs[year] = (store.aggregate(year) if str(year) in store.manifest["years"]
+                                             else StreamAggregate())
+                    store._aggs[year].add(part)
+                    touched.add(year)
+        if touched or store.manifest["source"] != new_source:
+            store._save(sorted(touched), new_source)
+    return store
+
+
+def yoy_deltas(store, dim, year, geo, gender, age):
+    """Churn rate per ``dim`` segment in ``year`` vs the previous stored year.
+
+    Returns ``None`` when ``year`` has no earlier partition to compare with.
+    """
+    earlier = [y for y in store.years if y < year]
+    if not earlier:
+        return None
+    prev = earlier[-1]
+    cur_stats  = rollup(slice_cube(store.cube(year), geo, gender, age), dim)
+    prev_stats = rollup(slice_cube(store.cube(prev), geo, gender, age), dim)
+    out = pd.DataFrame({
+        f"Customers {prev}":      prev_stats["Customers"],
+        f"Churn Rate {prev} (%)": (prev_stats["ChurnRate"]*100).round(1),
+        f"Customers {year}":      cur_stats["Customers"],
+        f"Churn Rate {year} (%)": (cur_stats["ChurnRate"]*100).round(1),
+    })
+    out["Change (pp)"] = ((cur_stats["ChurnRate"] - prev_stats["ChurnRate"])*100).round(1)
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from segment_cube import totals
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=churn_data.DATA_PATH)
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+
+    store = refresh(args.csv, rebuild=args.rebuild, chunksize=args.chunksize)
+    for year in store.years:
+        customers, churned = totals(store.cube(year))
+        print(f"{year}: {customers:,} customers · {churned:,} churned "
+              f"({churned / customers * 100:.1f}%)")